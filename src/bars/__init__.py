@@ -14,5 +14,38 @@ TimeBars
 
 VolumeBars
 	VolumeBars class where trade bars are formed by aggregating ticks until a volume threshold has been met.
+
+TickFilter
+	TickFilter class specifying ticks to drop by trade conditions and exchange while loading tick data.
+
+BarStore
+	BarStore class persisting bars to binary files partitioned by symbol, bar type, threshold and date, with fast range queries.
+
+Functions
+----------
+stream_bars
+	Asynchronous generator which builds bars incrementally from an asynchronous feed of ticks, yielding bars as they are completed.
+
+Command line
+----------
+bars
+	Console script building bars from a tick file and writing them as binary output, see bars.cli.
 """
-from .bars import BarsBase, TickBars, TimeBars, VolumeBars
\ No newline at end of file
+import importlib
+
+# submodules are imported on first attribute access (PEP 562), so that importing bars, e.g. for the command line entry point
+# (bars.cli), does not pay for importing pandas unless a DataFrame based class is actually used
+_EXPORTS = {'BarsBase': 'bars', 'TickBars': 'bars', 'TimeBars': 'bars', 'VolumeBars': 'bars', 'TickFilter': 'bars',
+			'BarStore': 'store', 'stream_bars': 'stream'}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+	if name not in _EXPORTS:
+		raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+	value = getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+	globals()[name] = value
+	return value
+
+def __dir__():
+	return sorted(list(globals()) + __all__)
\ No newline at end of file
@@ -0,0 +1,247 @@
+import bz2
+import collections
+import concurrent.futures
+import gzip
+import io
+import lzma
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+BLOCK_SIZE = 1 << 20 # bytes of decompressed data read at a time
+QUEUE_SIZE = 16 # decompressed blocks buffered ahead of the parser
+
+_ZSTD_MAGIC = 0xFD2FB528
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A50 # to 0x184D2A5F
+
+def infer_compression(file_path, compression = 'infer'):
+	"""
+    Determines whether a tick data file is decompressed in a background thread (see open_compressed), either from the compression argument
+    or, if 'infer', from the file path's suffix. Only local files compressed with one of the codecs of COMPRESSION_SUFFIXES are handled,
+    everything else (other compression methods or their dict forms, tar archives, URLs and file objects) is left for pandas.read_csv.
+
+    Parameters
+    ----------
+    file_path : str, os.PathLike, file-like
+        Path to data file/csv.
+    compression : str, dict, None
+        Compression argument of pandas.read_csv, e.g. 'infer', 'gzip', 'zstd' or None.
+
+    Returns
+    -------
+    str, None
+        Compression of the file, or None if the file is left for pandas.read_csv.
+
+    """
+	if not isinstance(file_path, (str, os.PathLike)) or not isinstance(compression, str) or not os.path.isfile(file_path):
+		return None
+	if compression != 'infer':
+		return compression if compression in COMPRESSION_SUFFIXES.values() else None
+	root, suffix = os.path.splitext(os.fspath(file_path).lower())
+	if root.endswith('.tar'):
+		return None
+	return COMPRESSION_SUFFIXES.get(suffix)
+
+def open_compressed(file_path, compression, workers = None):
+	"""
+    Opens a compressed file as a binary file object whose data is decompressed in a background thread, so that decompression and
+    parsing of the decompressed data run at the same time. Files made of several independently compressed members whose sizes are
+    known up front (BGZF gzip blocks or zstd frames) are also decompressed in parallel by a pool of threads.
+
+    Parameters
+    ----------
+    file_path : str, os.PathLike
+        Path to compressed file.
+    compression : str
+        One of 'gzip', 'bz2', 'xz' or 'zstd'.
+    workers : int, None
+        Number of threads decompressing members in parallel, by default the number of CPUs.
+
+    Returns
+    -------
+    io.BufferedReader
+        Binary file object of the decompressed data.
+
+    """
+	if compression == 'zstd':
+		try:
+			import zstandard
+		except ImportError:
+			raise ImportError("the zstandard package is required to read zstd compressed tick data") from None
+	workers = workers or os.cpu_count() or 1
+	if compression == 'bz2':
+		return _threaded(_stream_chunks(bz2.open(file_path, 'rb')))
+	if compression == 'xz':
+		return _threaded(_stream_chunks(lzma.open(file_path, 'rb')))
+	with open(file_path, 'rb') as raw:
+		size = os.fstat(raw.fileno()).st_size
+		data = mmap.mmap(raw.fileno(), 0, access = mmap.ACCESS_READ) if size > 0 else b''
+	if compression == 'zstd':
+		return _threaded(_parallel_chunks(_zstd_frames(data), lambda frame: zstandard.ZstdDecompressor().decompressobj().decompress(frame), workers), data)
+	if _is_bgzf(data):
+		return _threaded(_parallel_chunks(_bgzf_members(data), lambda member: zlib.decompress(member, 31), workers), data)
+	if isinstance(data, mmap.mmap):
+		data.close()
+	return _threaded(_stream_chunks(gzip.open(file_path, 'rb')))
+
+def _threaded(chunks, source = None):
+	"""
+    Wraps a generator of decompressed blocks, run in a background thread, as a buffered binary file object.
+    """
+	return io.BufferedReader(_ThreadedReader(chunks, source), buffer_size = BLOCK_SIZE)
+
+def _stream_chunks(file_obj):
+	"""
+    Generator of decompressed blocks read serially from a decompressing file object.
+    """
+	with file_obj:
+		while True:
+			chunk = file_obj.read(BLOCK_SIZE)
+			if not chunk:
+				return
+			yield chunk
+
+def _parallel_chunks(members, decompress, workers):
+	"""
+    Generator of decompressed members, in order, with up to twice the number of workers decompressing ahead in a thread pool.
+    zlib and zstandard release the GIL while decompressing, so the threads run in parallel.
+    """
+	with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+		pending = collections.deque()
+		for member in members:
+			pending.append(executor.submit(decompress, member))
+			if len(pending) > 2 * workers:
+				yield pending.popleft().result()
+		while pending:
+			yield pending.popleft().result()
+
+def _bgzf_header_size(data, offset):
+	"""
+    Returns the compressed size of the gzip member starting at offset if its header records it (BGZF blocks as written by bgzip),
+    otherwise None, as member boundaries of other gzip files can only be found by decompressing.
+    """
+	# header: magic, method, flags (with extra field), mtime, extra flags, os, extra length
+	if len(data) - offset < 12 or data[offset:offset + 4] != b'\x1f\x8b\x08\x04':
+		return None
+	extra_end = offset + 12 + struct.unpack_from('<H', data, offset + 10)[0]
+	extra = offset + 12
+	while extra + 4 <= extra_end:
+		sub_len = struct.unpack_from('<H', data, extra + 2)[0]
+		if data[extra:extra + 2] == b'BC' and sub_len == 2:
+			return struct.unpack_from('<H', data, extra + 4)[0] + 1
+		extra += 4 + sub_len
+	return None
+
+def _is_bgzf(data):
+	"""
+    Returns whether gzip compressed data is made of BGZF blocks, judged by its first member.
+    """
+	return _bgzf_header_size(data, 0) is not None
+
+def _bgzf_members(data):
+	"""
+    Generator splitting BGZF gzip compressed data into its members.
+    """
+	offset = 0
+	while offset < len(data):
+		block_size = _bgzf_header_size(data, offset)
+		if block_size is None:
+			raise ValueError("gzip member at byte {} does not record its size".format(offset))
+		yield data[offset:offset + block_size]
+		offset += block_size
+
+def _zstd_frames(data):
+	"""
+    Generator splitting zstd compressed data into its frames by walking the frame and block headers, skipping skippable frames.
+    """
+	offset = 0
+	while offset < len(data):
+		magic = struct.unpack_from('<I', data, offset)[0]
+		if magic & 0xFFFFFFF0 == _ZSTD_SKIPPABLE_MAGIC:
+			offset += 8 + struct.unpack_from('<I', data, offset + 4)[0]
+			continue
+		if magic != _ZSTD_MAGIC:
+			raise ValueError("invalid zstd frame at byte {}".format(offset))
+		descriptor = data[offset + 4]
+		dict_id_size = (0, 1, 2, 4)[descriptor & 0x3]
+		single_segment = (descriptor >> 5) & 0x1
+		content_size_size = (single_segment, 2, 4, 8)[descriptor >> 6]
+		start = offset
+		offset += 5 + (not single_segment) + dict_id_size + content_size_size
+		last_block = False
+		while not last_block:
+			header = int.from_bytes(data[offset:offset + 3], 'little')
+			last_block = header & 0x1
+			block_type = (header >> 1) & 0x3
+			offset += 3 + (1 if block_type == 1 else header >> 3)
+		if descriptor & 0x4:
+			offset += 4 # content checksum
+		yield data[start:offset]
+
+class _ThreadedReader(io.RawIOBase):
+	"""
+    Raw binary file object reading decompressed blocks produced by a background thread through a bounded queue.
+    """
+
+	def __init__(self, chunks, source = None):
+		self._queue = queue.Queue(maxsize = QUEUE_SIZE)
+		self._buffer = memoryview(b'')
+		self._source = source
+		self._done = False
+		self._stop = threading.Event()
+		self._thread = threading.Thread(target = self._produce, args = (chunks,), daemon = True)
+		self._thread.start()
+
+	def _produce(self, chunks):
+		try:
+			for chunk in chunks:
+				if not self._put(chunk):
+					return
+			self._put(None)
+		except BaseException as error:
+			self._put(error)
+		finally:
+			chunks.close()
+
+	def _put(self, item):
+		# give up once the reader has been closed rather than blocking on a full queue
+		while not self._stop.is_set():
+			try:
+				self._queue.put(item, timeout = 0.1)
+				return True
+			except queue.Full:
+				pass
+		return False
+
+	def readable(self):
+		return True
+
+	def readinto(self, b):
+		while not self._buffer:
+			if self._done:
+				return 0
+			chunk = self._queue.get()
+			if chunk is None:
+				self._done = True
+				return 0
+			if isinstance(chunk, BaseException):
+				self._done = True
+				raise chunk
+			self._buffer = memoryview(chunk)
+		n = min(len(b), len(self._buffer))
+		b[:n] = self._buffer[:n]
+		self._buffer = self._buffer[n:]
+		return n
+
+	def close(self):
+		if not self.closed:
+			self._stop.set()
+			self._thread.join()
+			self._buffer = memoryview(b'')
+			if isinstance(self._source, mmap.mmap):
+				self._source.close()
+		super().close()
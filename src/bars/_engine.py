@@ -0,0 +1,235 @@
+import re
+import numpy as np
+
+DAY_NS = 86400 * 10**9
+
+def time_of_day_ns(text):
+	"""
+    Parses a time of day given as HH:MM[:SS[.fffffffff]], e.g. '09:30' or '16:00:00', where 24:00 is allowed as the end of a day.
+
+    Parameters
+    ----------
+    text : str
+        Time of day.
+
+    Returns
+    -------
+    int
+        Nanoseconds since midnight.
+
+    """
+	match = re.fullmatch(r'(\d{1,2}):(\d{2})(?::(\d{2})(?:\.(\d{1,9}))?)?', text.strip())
+	if match is None:
+		raise ValueError("expected a time of day as HH:MM[:SS], not {!r}".format(text))
+	hours, minutes, seconds, fraction = match.groups()
+	time_ns = ((int(hours) * 60 + int(minutes)) * 60 + int(seconds or 0)) * 10**9 + int((fraction or '').ljust(9, '0'))
+	if int(minutes) > 59 or int(seconds or 0) > 59 or time_ns > DAY_NS:
+		raise ValueError("expected a time of day as HH:MM[:SS], not {!r}".format(text))
+	return time_ns
+
+def count_out_of_order(timestamps):
+	"""
+    Counts the ticks which are earlier than some tick before them. The common case of sorted times is detected with a single vectorised
+    comparison of neighbouring ticks, without computing the running maximum.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        int64 array of tick times in nanoseconds since the epoch.
+
+    Returns
+    -------
+    int
+        Number of out of order ticks, 0 if the times are sorted.
+
+    """
+	if len(timestamps) < 2 or not (timestamps[1:] < timestamps[:-1]).any():
+		return 0
+	return int(np.count_nonzero(timestamps < np.maximum.accumulate(timestamps)))
+
+def in_time_order(timestamps, prices, volumes = None):
+	"""
+    Returns the tick arrays in time order, stably sorting them only if count_out_of_order finds ticks out of order.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        int64 array of tick times in nanoseconds since the epoch.
+    prices : numpy.ndarray
+        Array of tick prices.
+    volumes : numpy.ndarray, None
+        Array of tick volumes.
+
+    Returns
+    -------
+    tuple
+        Tuple of (out of order count, timestamps, prices, volumes).
+
+    """
+	count = count_out_of_order(timestamps)
+	if count:
+		order = np.argsort(timestamps, kind = 'stable')
+		timestamps, prices = timestamps[order], prices[order]
+		volumes = volumes[order] if volumes is not None else None
+	return (count, timestamps, prices, volumes)
+
+def tick_bars(timestamps, prices, threshold):
+	"""
+    Constructs tick bars from arrays of tick times and prices, where each bar holds threshold ticks and is labelled by the time of its
+    last tick. Remaining ticks which do not fill a bar are left out.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        int64 array of tick times in nanoseconds since the epoch.
+    prices : numpy.ndarray
+        Array of tick prices.
+    threshold : int
+        Number of ticks per bar.
+
+    Returns
+    -------
+    tuple
+        Tuple of arrays (ends, opens, highs, lows, closes) where ends is an int64 array of bar end times in nanoseconds.
+
+    """
+	count = len(prices) // threshold
+	grouped = prices[:count * threshold].reshape(count, threshold)
+	return (timestamps[threshold - 1::threshold][:count], grouped[:, 0], grouped.max(axis = 1), grouped.min(axis = 1), grouped[:, -1])
+
+def volume_bars(timestamps, prices, volumes, threshold):
+	"""
+    Constructs volume bars from arrays of tick times, prices and volumes, where a bar is closed once its total volume meets the threshold
+    and is labelled by the time of the tick closing it. A tick with volume in excess of the threshold closes as many bars as its volume
+    fills and the remaining volume starts the next bar at the tick's price.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        int64 array of tick times in nanoseconds since the epoch.
+    prices : numpy.ndarray
+        Array of tick prices.
+    volumes : numpy.ndarray
+        Array of tick volumes.
+    threshold : int, float
+        Total volume per bar.
+
+    Returns
+    -------
+    tuple
+        Tuple of arrays (ends, opens, highs, lows, closes) where ends is an int64 array of bar end times in nanoseconds.
+
+    """
+	ends, opens, highs, lows, closes = [], [], [], [], []
+	cur_open = cur_high = cur_low = None
+	volume = 0
+	for timestamp, price, tick_volume in zip(timestamps.tolist(), prices.tolist(), volumes.tolist()):
+		if cur_open is None:
+			cur_open = cur_high = cur_low = price
+		else:
+			cur_high = price if price > cur_high else cur_high
+			cur_low = price if price < cur_low else cur_low
+		volume += tick_volume
+		if volume >= threshold:
+			while volume >= threshold:
+				ends.append(timestamp)
+				opens.append(cur_open)
+				highs.append(cur_high)
+				lows.append(cur_low)
+				closes.append(price)
+				volume -= threshold
+				# new bar if still excess volume
+				cur_open = cur_high = cur_low = price
+			if volume == 0:
+				cur_open = None
+	return (np.array(ends, dtype = np.int64),) + tuple(np.array(values, dtype = prices.dtype) for values in (opens, highs, lows, closes))
+
+def session_ids(timestamps, sessions):
+	"""
+    Assigns each tick to a trading session, where sessions are given as time of day intervals repeated every day.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        int64 array of tick times in nanoseconds since the epoch, in the time zone the sessions are given in.
+    sessions : list
+        List of (start, end) tuples of nanoseconds since midnight, where a session includes its start but not its end. A session whose
+        end is not after its start crosses midnight, e.g. 18:00 to 06:00, and belongs to the day it starts on.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 array of session ids, unique per day and session, with -1 for ticks falling outside every session.
+
+    """
+	day, time_of_day = np.divmod(timestamps, DAY_NS)
+	ids = np.full(len(timestamps), -1, dtype = np.int64)
+	for n, (start, end) in enumerate(sessions):
+		if start < end:
+			in_session = (time_of_day >= start) & (time_of_day < end)
+			session_day = day
+		else:
+			in_session = (time_of_day >= start) | (time_of_day < end)
+			session_day = day - (time_of_day < end)
+		ids[in_session] = session_day[in_session] * len(sessions) + n
+	return ids
+
+def time_bars(timestamps, prices, dt, origin, fill_empty = True, sessions = None, local_times = None):
+	"""
+    Constructs time bars from arrays of tick times and prices, where bar n covers the interval [origin + n * dt, origin + (n + 1) * dt)
+    and is labelled by its end time. Ticks are assigned to bars with a single vectorised pass, so the cost is proportional to the number
+    of ticks and non-empty bars.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        Sorted int64 array of tick times in nanoseconds since the epoch.
+    prices : numpy.ndarray
+        Array of tick prices.
+    dt : int
+        Length of each bar in nanoseconds.
+    origin : int
+        Time of a bar edge in nanoseconds since the epoch.
+    fill_empty : bool
+        If True, empty bars between non-empty bars are included with NaN prices, otherwise they are skipped.
+    sessions : list, None
+        List of (start, end) tuples of nanoseconds since midnight (see session_ids). If given, ticks outside every session are dropped
+        and empty bars are only filled in between non-empty bars of the same session.
+    local_times : numpy.ndarray, None
+        int64 array of the tick times in local wall time, used to assign ticks to sessions. If None, timestamps are used.
+
+    Returns
+    -------
+    tuple
+        Tuple of arrays (ends, opens, highs, lows, closes) where ends is an int64 array of bar end times in nanoseconds.
+
+    """
+	if sessions is not None:
+		ids = session_ids(timestamps if local_times is None else local_times, sessions)
+		in_session = ids >= 0
+		timestamps, prices, ids = timestamps[in_session], prices[in_session], ids[in_session]
+	if len(timestamps) == 0:
+		return (np.empty(0, dtype = np.int64),) + (np.empty(0, dtype = prices.dtype),) * 4
+	numbers = (timestamps - origin) // dt
+	starts = np.flatnonzero(np.r_[True, numbers[1:] != numbers[:-1]])
+	numbers = numbers[starts]
+	opens = prices[starts]
+	highs = np.maximum.reduceat(prices, starts)
+	lows = np.minimum.reduceat(prices, starts)
+	closes = prices[np.r_[starts[1:], len(prices)] - 1]
+	if fill_empty:
+		gaps = np.r_[numbers[1:] - numbers[:-1] - 1, 0]
+		if sessions is not None:
+			gaps[:-1][ids[starts][1:] != ids[starts][:-1]] = 0
+		if gaps.any():
+			lengths = gaps + 1
+			positions = np.r_[0, np.cumsum(lengths)[:-1]]
+			total = positions[-1] + lengths[-1]
+			numbers = np.repeat(numbers, lengths) + (np.arange(total) - np.repeat(positions, lengths))
+			filled = []
+			for values in (opens, highs, lows, closes):
+				out = np.full(total, np.nan)
+				out[positions] = values
+				filled.append(out)
+			opens, highs, lows, closes = filled
+	return ((numbers + 1) * dt + origin, opens, highs, lows, closes)
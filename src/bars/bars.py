@@ -1,12 +1,85 @@
+import numbers
+import re
 import pandas as pd
 import numpy as np
+from . import _compression, _engine
+
+FILTER_CHUNKSIZE = 1000000 # number of rows parsed at a time when filtering ticks while loading
+# format = 'mixed' (parsing each time separately) was added in pandas 2.0, earlier versions do so without a format
+_MIXED_FORMAT = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+class TickFilter:
+
+	def __init__(self, exclude_conditions = None, include_exchanges = None, exclude_exchanges = None,
+				 conditions_col = 'trade_conditions', exchange_col = 'exchange_code', conditions_sep = '-'):
+		"""
+	    Construct TickFilter object specifying which ticks to drop when loading tick data, e.g. odd-lot, late reported or out of sequence prints.
+	    A tick is dropped if any of its trade conditions is excluded or if its exchange is not included (or is excluded).
+	    The filter is passed to the bar constructors or set_tick_data with the tick_filter keyword argument, so that dropped ticks are removed
+	    chunk by chunk while parsing rather than from the fully loaded tick data.
+
+	    Parameters
+	    ----------
+	    exclude_conditions : iterable, None
+	        Trade condition codes to exclude.
+	    include_exchanges : iterable, None
+	        Exchange codes to keep, all other exchanges are dropped. If None, all exchanges are kept.
+	    exclude_exchanges : iterable, None
+	        Exchange codes to drop.
+	    conditions_col : str
+	        Name of the trade conditions column, whose values hold one or more condition codes separated by conditions_sep.
+	    exchange_col : str
+	        Name of the exchange code column.
+	    conditions_sep : str
+	        Separator between condition codes in the trade conditions column.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		self._exclude_conditions = set(exclude_conditions) if exclude_conditions is not None else None
+		self._include_exchanges = list(include_exchanges) if include_exchanges is not None else None
+		self._exclude_exchanges = list(exclude_exchanges) if exclude_exchanges is not None else None
+		self._conditions_col = conditions_col
+		self._exchange_col = exchange_col
+		self._conditions_sep = conditions_sep
+
+	def mask(self, tick_data):
+		"""
+	    Computes which ticks pass the filter with a single vectorised pass over the relevant columns. Trade conditions are only split once
+	    per distinct value of the column rather than once per tick.
+
+	    Parameters
+	    ----------
+	    tick_data : pandas.DataFrame
+	        pandas DataFrame of tick data.
+
+	    Returns
+	    -------
+	    numpy.ndarray
+	        Boolean array which is True for ticks to keep.
+
+	    """
+		keep = np.ones(len(tick_data), dtype = bool)
+		if self._exclude_conditions:
+			codes, conditions = pd.factorize(tick_data[self._conditions_col])
+			keep_conditions = np.array([self._exclude_conditions.isdisjoint(str(value).split(self._conditions_sep)) for value in conditions] + [True])
+			keep &= keep_conditions[codes] # code -1 (missing conditions) maps to the final True
+		if self._include_exchanges is not None:
+			keep &= tick_data[self._exchange_col].isin(self._include_exchanges).values
+		if self._exclude_exchanges:
+			keep &= ~tick_data[self._exchange_col].isin(self._exclude_exchanges).values
+		return keep
+
 
 class BarsBase:
 
-	def __init__(self, threshold, file_path, **kwargs):
+	def __init__(self, threshold, file_path = None, **kwargs):
 		"""
 	    Construct BarsBase object, initialised with threshold (dependent on bar (sub-)type), file path to CSV or text document along with other keyword
         arguments to be passed to the pandas read_csv function to construct a pandas dataframe.
+        The file path may be left as None when bars are only built incrementally from a live feed (see update_bars and bars.stream_bars).
         Required keyword arguments include index_col specifying the column number to be used as the dataframe's index which should be datetimes, these
         are parsed automatically so there is no need to specify the parse_dates argument. Additionally, a column with the name < price > must be specified
         as well as a < volume > column if creating volume bars.
@@ -16,8 +89,8 @@ class BarsBase:
 	    ----------
 	    threshold : int
 	        threshold value for corresponding (sub-)bar type..
-	    file_path : str
-	        Path to data file/csv.
+	    file_path : str, None
+	        Path to data file/csv. If None, no tick data is loaded.
 	    **kwargs 
 	        Keyword arguments to pass through to pandas.read_csv.
             See above for required keyword arguments.
@@ -28,8 +101,13 @@ class BarsBase:
         
 	    """
 		self._threshold = threshold
-		self.set_tick_data(file_path, **kwargs)
+		self._tick_data = None
+		self._symbol_col = None
+		self._out_of_order = 0
+		if file_path is not None:
+			self.set_tick_data(file_path, **kwargs)
 		self._bars_data = None
+		self.reset_stream()
 
 	def get_threshold(self):
 		"""
@@ -71,17 +149,25 @@ class BarsBase:
 	    """
 		return self._tick_data
 
-	def set_tick_data(self, file_path, **kwargs):
+	def set_tick_data(self, file_path, symbol_col = None, tick_filter = None, **kwargs):
 		"""
 	    Setter method for setting the tick_data pandas DataFrame with a csv file along with other keyword arguments to be passed to the pandas read_csv function.
         Required keyword arguments include index_col specifying the column number to be used as the dataframe's index which should be datetimes, these
         are parsed automatically so there is no need to specify the parse_dates argument. Additionally, a column with the name < price > must be specified
         as well as a < volume > column if creating volume bars.
+        Files holding several instruments may name a symbol column with symbol_col, in which case bars are constructed separately for every symbol.
+        If a tick_filter is given, the file is parsed in chunks and filtered ticks are dropped from each chunk, so they are never part of the tick data.
+        Compressed files (gzip, bz2, xz or zstd, inferred from the file suffix or given with the compression keyword argument) are decompressed in a
+        background thread while being parsed, see bars._compression. Other compression (e.g. zip or tar) and remote files are left for pandas.read_csv.
 
 	    Parameters
 	    ----------
 	    file_path : str
 	        Path to data file/csv.
+	    symbol_col : str, None
+	        Name of the column holding each tick's symbol, or None if the file holds a single instrument.
+	    tick_filter : TickFilter, None
+	        Filter specifying ticks to drop while loading, or None to keep all ticks.
 	    **kwargs 
 	        Keyword arguments to pass through to pandas.read_csv.
             See above for required keyword arguments.
@@ -93,7 +179,133 @@ class BarsBase:
 	    """
 		if 'parse_dates' in kwargs:
 			del kwargs['parse_dates']
-		self._tick_data = pd.read_csv(filepath_or_buffer = file_path, parse_dates = True, **kwargs)
+		compression = _compression.infer_compression(file_path, kwargs.get('compression', 'infer'))
+		if compression is None:
+			self._tick_data = self._read_tick_data(file_path, tick_filter, **kwargs)
+		else:
+			# decompress in a background thread while pandas parses
+			kwargs['compression'] = None
+			with _compression.open_compressed(file_path, compression) as buffer:
+				self._tick_data = self._read_tick_data(buffer, tick_filter, **kwargs)
+		self._tick_data.index = self._datetime_index(self._tick_data.index)
+		self.set_symbol_column(symbol_col)
+
+	@staticmethod
+	def _read_tick_data(file_path, tick_filter, **kwargs):
+		"""
+	    Reads tick data with pandas.read_csv, dropping ticks failing the tick filter chunk by chunk if one is given.
+
+	    Parameters
+	    ----------
+	    file_path : str, file-like
+	        Path to data file/csv or file object of its data.
+	    tick_filter : TickFilter, None
+	        Filter specifying ticks to drop while loading, or None to keep all ticks.
+	    **kwargs
+	        Keyword arguments to pass through to pandas.read_csv.
+
+	    Returns
+	    -------
+	    pandas.DataFrame
+	        pandas DataFrame of tick data.
+
+	    """
+		if tick_filter is None:
+			return pd.read_csv(filepath_or_buffer = file_path, parse_dates = True, **kwargs)
+		kwargs.setdefault('chunksize', FILTER_CHUNKSIZE)
+		with pd.read_csv(filepath_or_buffer = file_path, parse_dates = True, **kwargs) as reader:
+			chunks = [chunk[tick_filter.mask(chunk)] for chunk in reader]
+		tick_data = pd.concat(chunks) if chunks else pd.DataFrame()
+		if len(tick_data) == 0 and not isinstance(tick_data.index, pd.DatetimeIndex):
+			# every tick was filtered out
+			tick_data.index = pd.DatetimeIndex([], name = tick_data.index.name)
+		return tick_data
+
+	@staticmethod
+	def _datetime_index(index):
+		"""
+	    Converts an index of datetime strings which read_csv leaves unparsed, e.g. times of mixed precision such as 04:00:00 and 04:00:00.5,
+	    into a DatetimeIndex. Times with mixed UTC offsets (e.g. either side of a daylight saving change) are converted to UTC.
+	    Other indexes are returned unchanged.
+
+	    Parameters
+	    ----------
+	    index : pandas.Index
+	        Index of the tick data.
+
+	    Returns
+	    -------
+	    pandas.Index
+	        DatetimeIndex of the tick times, or the given index if it does not hold strings.
+
+	    """
+		if isinstance(index, pd.DatetimeIndex) or not (pd.api.types.is_object_dtype(index) or pd.api.types.is_string_dtype(index)):
+			return index
+		try:
+			return pd.DatetimeIndex(pd.to_datetime(index, **_MIXED_FORMAT), name = index.name)
+		except ValueError:
+			try:
+				return pd.DatetimeIndex(pd.to_datetime(index, utc = True, **_MIXED_FORMAT), name = index.name)
+			except ValueError:
+				return index
+
+	def get_out_of_order_count(self):
+		"""
+	    Getter method for the number of out of order ticks, i.e. ticks earlier than a tick before them (within their symbol), found by the
+	    last call to make_bars or, for streams, by the last call to bars.stream_bars.
+
+	    Returns
+	    -------
+	    int
+	        Number of out of order ticks.
+
+	    """
+		return self._out_of_order
+
+	def set_out_of_order_count(self, count):
+		"""
+	    Setter method for the number of out of order ticks, used by bars.stream_bars to count ticks arriving out of order in a stream.
+
+	    Parameters
+	    ----------
+	    count : int
+	        Number of out of order ticks.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		self._out_of_order = count
+
+	def get_symbol_column(self):
+		"""
+	    Getter method for the name of the symbol column.
+
+	    Returns
+	    -------
+	    str, None
+	        Name of the column holding each tick's symbol, or None if the tick data holds a single instrument.
+
+	    """
+		return self._symbol_col
+
+	def set_symbol_column(self, symbol_col):
+		"""
+	    Setter method for the name of the symbol column. If set, make_bars constructs bars for every symbol in a single pass and the bars
+	    data is indexed by (symbol, Timestamp).
+
+	    Parameters
+	    ----------
+	    symbol_col : str, None
+	        Name of the column holding each tick's symbol, or None if the tick data holds a single instrument.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		self._symbol_col = symbol_col
 
 	def get_bars_data(self):
 		"""
@@ -107,6 +319,68 @@ class BarsBase:
 	    """
 		return self._bars_data
 
+	def _make_bars_data(self, make):
+		"""
+	    Constructs the bars DataFrame by calling make on numpy arrays of the tick data, once per symbol if a symbol column is set.
+	    Ticks are ordered by symbol (keeping time order within each symbol) into a single array, so that each symbol is a slice given
+	    by its offsets rather than a copy. Tick times are checked to be in order with a single O(n) pass and are only sorted (stably)
+	    if they are not, with the number of out of order ticks kept for get_out_of_order_count.
+
+	    Parameters
+	    ----------
+	    make : callable
+	        Function of (timestamps, prices, volumes) returning arrays (ends, opens, highs, lows, closes), see bars._engine.
+	        Times are int64 nanoseconds (UTC for timezone aware tick data) and volumes is None if the tick data has no < volume > column.
+
+	    Returns
+	    -------
+	    pandas.DataFrame
+	        pandas DataFrame of bars with columns Open, High, Low and Close.
+
+	    """
+		tick_data = self.get_tick_data()
+		if len(tick_data) == 0:
+			return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close'])
+		index = tick_data.index
+		if not isinstance(index, pd.DatetimeIndex):
+			raise TypeError("tick data must be indexed by datetimes (see the index_col keyword argument), not {}".format(type(index).__name__))
+		tz = index.tz
+		if tz is not None:
+			index = index.tz_convert(None)
+		timestamps = index.values.astype('datetime64[ns]').view('i8')
+		prices = tick_data['price'].values
+		volumes = tick_data['volume'].values if 'volume' in tick_data.columns else None
+
+		def to_index(ends):
+			bars_index = pd.DatetimeIndex(ends.astype('datetime64[ns]'), name = 'Timestamp').astype(index.dtype)
+			if tz is not None:
+				bars_index = bars_index.tz_localize('UTC').tz_convert(tz)
+			return bars_index
+
+		if self._symbol_col is None:
+			self._out_of_order, timestamps, prices, volumes = _engine.in_time_order(timestamps, prices, volumes)
+			ends, opens, highs, lows, closes = make(timestamps, prices, volumes)
+			if len(ends) == 0:
+				return pd.DataFrame(columns=['Timestamp', 'Open', 'High', 'Low', 'Close']).set_index('Timestamp')
+			return pd.DataFrame({'Open': opens, 'High': highs, 'Low': lows, 'Close': closes}, index = to_index(ends))
+		codes, symbols = pd.factorize(tick_data[self._symbol_col], sort = True)
+		if (codes[1:] < codes[:-1]).any():
+			order = np.argsort(codes, kind = 'stable')
+			codes, timestamps, prices = codes[order], timestamps[order], prices[order]
+			volumes = volumes[order] if volumes is not None else None
+		offsets = np.searchsorted(codes, np.arange(len(symbols) + 1))
+		self._out_of_order = sum(_engine.count_out_of_order(timestamps[start:end]) for start, end in zip(offsets[:-1], offsets[1:]))
+		if self._out_of_order:
+			order = np.lexsort((timestamps, codes))
+			timestamps, prices = timestamps[order], prices[order]
+			volumes = volumes[order] if volumes is not None else None
+		results = [make(timestamps[start:end], prices[start:end], volumes[start:end] if volumes is not None else None)
+				   for start, end in zip(offsets[:-1], offsets[1:])]
+		ends, opens, highs, lows, closes = (np.concatenate(arrays) for arrays in zip(*results))
+		bars_symbols = np.repeat(np.asarray(symbols), [len(result[0]) for result in results])
+		bars_index = pd.MultiIndex.from_arrays([bars_symbols, to_index(ends)], names = [self._symbol_col, 'Timestamp'])
+		return pd.DataFrame({'Open': opens, 'High': highs, 'Low': lows, 'Close': closes}, index = bars_index)
+
 	@staticmethod
 	def set_OHLC(cur_open, cur_high, cur_low, cur_close, cur_price):
 		"""
@@ -139,10 +413,65 @@ class BarsBase:
 		cur_close = cur_price
 		return (cur_open, cur_high, cur_low, cur_close)
 
+	def reset_stream(self):
+		"""
+	    Resets the incremental state used by update_bars (implemented by the sub-classes), close_bars and flush_bars, discarding any partially
+	    built bar.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		self._stream_OHLC = (None, None, None, None)
+
+	def close_bars(self, timestamp):
+		"""
+	    Closes any bars which end at or before the given time without requiring a new tick. Only time bars can be closed this way,
+	    for other bar types no bars are returned.
+
+	    Parameters
+	    ----------
+	    timestamp : pandas.Timestamp
+	        Current time.
+
+	    Returns
+	    -------
+	    list
+	        List of completed bars as tuples of (Timestamp, Open, High, Low, Close).
+
+	    """
+		return []
+
+	def next_bar_close(self):
+		"""
+	    Returns the time at which the current incremental bar closes, or None if bars are not closed by time.
+
+	    Returns
+	    -------
+	    pandas.Timestamp, None
+	        End time of the current bar.
+
+	    """
+		return None
+
+	def flush_bars(self):
+		"""
+	    Ends the incremental stream, returning the final partial bar where make_bars would also include it, and resets the stream state.
+
+	    Returns
+	    -------
+	    list
+	        List of remaining bars as tuples of (Timestamp, Open, High, Low, Close).
+
+	    """
+		self.reset_stream()
+		return []
+
 
 class TickBars(BarsBase):
 
-	def __init__(self, threshold, file_path, **kwargs):
+	def __init__(self, threshold, file_path = None, **kwargs):
 		"""
 	    Construct TickBars object where trade bars are grouped by number of ticks/trades.
         TickBars objects are initialised with a threshold specifying the number of ticks per bar, file path to CSV or text document along with other keyword
@@ -154,8 +483,8 @@ class TickBars(BarsBase):
 	    ----------
 	    threshold : int
             Number of trades within each bar.
-        file_path : str
-            Path to data file/csv.
+        file_path : str, None
+            Path to data file/csv. If None, no tick data is loaded.
         **kwargs 
             Keyword arguments to pass through to pandas.read_csv.
             See above for required keyword arguments.
@@ -180,26 +509,56 @@ class TickBars(BarsBase):
 		if self.get_threshold() == 0:
 			self._bars_data = pd.DataFrame(columns=['Open', 'High', 'Low', 'Close'])
 			return
-		data = []
-		# initialise loop variables
-		cur_open = cur_high = cur_low = cur_close = None
-		count = 0
-		for tick in self.get_tick_data().itertuples():
-			# do next tick
-			cur_open, cur_high, cur_low, cur_close = self.set_OHLC(cur_open, cur_high, cur_low, cur_close, tick.price)
-			count += 1
-			# end bar
-			if count == self.get_threshold():
-				data.append((tick.Index, cur_open, cur_high, cur_low, cur_close))
-				cur_open = None
-				count = 0
-		self._bars_data = pd.DataFrame(data, columns=['Timestamp', 'Open', 'High', 'Low', 'Close'])
-		self._bars_data.set_index('Timestamp', inplace=True)
+		if not isinstance(self.get_threshold(), numbers.Integral) or self.get_threshold() < 0:
+			raise ValueError("threshold of tick bars must be a positive integer, not {!r}".format(self.get_threshold()))
+		self._bars_data = self._make_bars_data(lambda timestamps, prices, volumes: _engine.tick_bars(timestamps, prices, self.get_threshold()))
+
+	def reset_stream(self):
+		"""
+	    Resets the incremental state, see BarsBase.reset_stream.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		super().reset_stream()
+		self._stream_count = 0
+
+	def update_bars(self, timestamp, price, volume = None):
+		"""
+	    Adds a single tick to the incremental bar state, closing a bar once the threshold number of ticks has been reached.
+
+	    Parameters
+	    ----------
+	    timestamp : pandas.Timestamp
+	        Time of the trade.
+	    price : int, float
+	        Trade price.
+	    volume : int, float, None
+	        Trade volume, unused for tick bars.
+
+	    Returns
+	    -------
+	    list
+	        List of completed bars as tuples of (Timestamp, Open, High, Low, Close).
+
+	    """
+		if self.get_threshold() == 0:
+			return []
+		self._stream_OHLC = self.set_OHLC(*self._stream_OHLC, price)
+		self._stream_count += 1
+		if self._stream_count == self.get_threshold():
+			bar = (timestamp,) + self._stream_OHLC
+			super().reset_stream()
+			self._stream_count = 0
+			return [bar]
+		return []
 
 
 class TimeBars(BarsBase):
 
-	def __init__(self, threshold, file_path, **kwargs):
+	def __init__(self, threshold, file_path = None, **kwargs):
 		"""
 	    Construct TimeBars object where trade bars are formed by grouping trades falling into specific time intervals.
         TimeBars objects are initialised with a threshold specifying the length of time per bar, where the timestamps on the resulting dataframe (after the 
@@ -214,8 +573,8 @@ class TimeBars(BarsBase):
 	    ----------
 	    threshold : int
 	        Length of time per bar (default in minutes).
-	    file_path : str
-	        Path to data file/csv.
+	    file_path : str, None
+	        Path to data file/csv. If None, no tick data is loaded.
 	    **kwargs
 	        Keyword arguments to pass through to pandas.read_csv.
             See above for required keyword arguments.
@@ -228,6 +587,9 @@ class TimeBars(BarsBase):
 		super().__init__(threshold, file_path, **kwargs)
 		self._unit = 'minutes' # default value for units, rather set in setter method than constructor to abide by Liskov substitution principle
 		self.set_threshold_Timedelta(threshold, self._unit)
+		self._origin = None
+		self._sessions = None
+		self._empty_bars = 'fill'
 
 	def set_unit(self, unit):
 		"""
@@ -329,32 +691,364 @@ class TimeBars(BarsBase):
 		if self.get_threshold()[0] == 0:
 			self._bars_data = pd.DataFrame(columns=['Open', 'High', 'Low', 'Close'])
 			return
+		tz = self.get_tick_data().index.tz
+		sessions = None
+		if self._sessions is not None:
+			sessions = [(start.value, end.value) for start, end in self._sessions]
+
+		def make(timestamps, prices, volumes):
+			first_tick = pd.Timestamp(timestamps[0]) if tz is None else pd.Timestamp(timestamps[0], tz = 'UTC').tz_convert(tz)
+			origin = self.get_origin_Timestamp(first_tick)
+			local_times = None
+			if tz is not None and sessions is not None:
+				# bars are binned in UTC, only sessions follow the local clock
+				local_times = pd.DatetimeIndex(timestamps.astype('datetime64[ns]')).tz_localize('UTC').tz_convert(tz).tz_localize(None).values.view('i8')
+			return _engine.time_bars(timestamps, prices, self._dt.value, origin.value, self._empty_bars == 'fill', sessions, local_times)
+
+		self._bars_data = self._make_bars_data(make)
+
+	def get_origin(self):
+		"""
+	    Getter method for the origin which bar edges are aligned to.
+
+	    Returns
+	    -------
+	    pandas.Timestamp, pandas.Timedelta, None
+	        Time of a bar edge, time of day of a bar edge or None if the first bar starts at the first tick.
+
+	    """
+		return self._origin
+
+	def set_origin(self, origin):
+		"""
+	    Setter method for the origin which bar edges are aligned to, so that bar edges fall on origin + n * bar length for whole numbers n.
+	    By default (None) the first bar starts at the first tick. A time of day, e.g. '09:30' or '09:30:00', aligns bar edges to that time on
+	    the day of the first tick, so that bars fall on clock boundaries. Strings which are neither a time of day nor start with a date
+	    (YYYY-MM-DD) raise a ValueError.
+
+	    Parameters
+	    ----------
+	    origin : str, pandas.Timestamp, pandas.Timedelta, None
+	        Time of a bar edge, time of day of a bar edge given as HH:MM[:SS] or pandas.Timedelta, or None.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		if isinstance(origin, str):
+			origin = pd.Timestamp(origin) if re.match(r'\d{4}-\d{2}-\d{2}', origin.strip()) else self._time_of_day(origin)
+		elif origin is not None and not isinstance(origin, pd.Timedelta):
+			origin = pd.Timestamp(origin)
+		self._origin = origin
+
+	@staticmethod
+	def _time_of_day(time):
+		"""
+	    Converts a time of day given as an HH:MM[:SS] string (see bars._engine.time_of_day_ns) or pandas.Timedelta into a pandas.Timedelta.
+	    """
+		if isinstance(time, str):
+			return pd.Timedelta(_engine.time_of_day_ns(time))
+		return pd.Timedelta(time)
+
+	def get_origin_Timestamp(self, first_tick):
+		"""
+	    Getter method which returns the origin as a pandas Timestamp, given the time of the first tick. For timezone aware ticks, a time of day
+	    (or a Timestamp without a timezone) is taken in the ticks' local time, shifted forward if it does not exist and the earlier of the
+	    two times if it is repeated, due to daylight saving changes.
+
+	    Parameters
+	    ----------
+	    first_tick : pandas.Timestamp
+	        Time of the first tick.
+
+	    Returns
+	    -------
+	    pandas.Timestamp
+	        Time of a bar edge.
+
+	    """
+		if self._origin is None:
+			return first_tick
+		origin = self._origin
+		if isinstance(origin, pd.Timedelta):
+			origin = first_tick.tz_localize(None).normalize() + origin
+		if first_tick.tzinfo is not None and origin.tzinfo is None:
+			origin = origin.tz_localize(first_tick.tzinfo, ambiguous = True, nonexistent = 'shift_forward')
+		return origin
+
+	def get_sessions(self):
+		"""
+	    Getter method for the trading sessions bars are restricted to.
+
+	    Returns
+	    -------
+	    list, None
+	        List of (start, end) tuples of pandas.Timedelta times of day, or None if bars are not restricted to sessions.
+
+	    """
+		return self._sessions
+
+	def set_sessions(self, sessions):
+		"""
+	    Setter method for the trading sessions bars are restricted to when constructed with make_bars, given as times of day repeated every day,
+	    e.g. [('09:30:00', '16:00:00')]. Ticks outside every session are ignored and empty bars are only filled in within a session, so that
+	    no bars are created over nights and weekends. Sessions include their start time but not their end time. A session whose end time is
+	    not after its start time, e.g. ('18:00', '06:00'), crosses midnight.
+
+	    Parameters
+	    ----------
+	    sessions : list, None
+	        List of (start, end) tuples of times of day as HH:MM[:SS] strings or pandas.Timedelta, or None to use all ticks.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		if sessions is not None:
+			sessions = [(self._time_of_day(start), self._time_of_day(end)) for start, end in sessions]
+		self._sessions = sessions
+
+	def get_empty_bars(self):
+		"""
+	    Getter method for how empty bars (intervals without any ticks) are handled.
+
+	    Returns
+	    -------
+	    str
+	        Either 'fill' or 'skip'.
+
+	    """
+		return self._empty_bars
+
+	def set_empty_bars(self, empty_bars):
+		"""
+	    Setter method for how empty bars (intervals without any ticks) are handled. With 'fill' (the default), empty bars are included
+	    with NaN prices. With 'skip', empty bars are left out entirely and gaps can be found from the differences between bar end times.
+
+	    Parameters
+	    ----------
+	    empty_bars : str
+	        Either 'fill' or 'skip'.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		if empty_bars not in ('fill', 'skip'):
+			raise ValueError("empty_bars must be 'fill' or 'skip', not {!r}".format(empty_bars))
+		self._empty_bars = empty_bars
+
+	def make_pyramid(self, resolutions):
+		"""
+	    Constructs bars for several coarser bar lengths from a single pass over the tick data. Bars are first constructed at the object's
+	    own (finest) bar length with make_bars, then each coarser bar length is derived by re-aggregating the bars of the largest finer bar
+	    length that divides it (first Open, max High, min Low, last Close), so that work after the first level is proportional to the number
+	    of bars rather than the number of ticks. The results are the same as constructing each bar length directly with make_bars.
+
+	    Parameters
+	    ----------
+	    resolutions : list
+	        List of (threshold, unit) tuples, as returned by get_threshold, each of which must be a whole multiple of the object's threshold.
+
+	    Returns
+	    -------
+	    dict
+	        Dictionary mapping each (threshold, unit) tuple, including the object's own threshold, to a pandas DataFrame of bars.
+
+	    """
+		if self.get_threshold()[0] == 0:
+			raise ValueError("threshold must be non-zero to construct a bars pyramid")
+		self.make_bars()
+		tick_data = self.get_tick_data()
+		price_dtype = tick_data['price'].dtype
+		if self._symbol_col is None:
+			origin = self.get_origin_Timestamp(tick_data.index.min()) if len(tick_data) > 0 else None
+		else:
+			first_ticks = tick_data.index.to_series().groupby(tick_data[self._symbol_col].values).min()
+			origins = {symbol: self.get_origin_Timestamp(first_tick) for symbol, first_tick in first_ticks.items()}
+		levels = [(self._dt, self.get_threshold(), self.get_bars_data())]
+		for threshold, unit in sorted(resolutions, key = lambda res: pd.Timedelta(*res)):
+			dt = pd.Timedelta(threshold, unit)
+			if dt % self._dt != pd.Timedelta(0):
+				raise ValueError("bar length of {} {} is not a multiple of {} {}".format(threshold, unit, *self.get_threshold()))
+			# derive from the coarsest level already built which divides this one
+			base_dt, _, base_bars = next(level for level in reversed(levels) if dt % level[0] == pd.Timedelta(0))
+			if self._symbol_col is None:
+				bars_data = self.aggregate_bars(base_bars, dt // base_dt, base_dt, origin)
+			elif len(base_bars) == 0:
+				bars_data = base_bars.copy()
+			else:
+				symbols = base_bars.index.get_level_values(0).unique()
+				bars_data = pd.concat([self.aggregate_bars(base_bars.xs(symbol, level = 0), dt // base_dt, base_dt, origins[symbol]) for symbol in symbols],
+									  keys = symbols, names = [self._symbol_col, 'Timestamp'])
+			if pd.api.types.is_integer_dtype(price_dtype) and not bars_data.isna().values.any():
+				# match the dtype make_bars would give without empty bars
+				bars_data = bars_data.astype(price_dtype)
+			levels.append((dt, (threshold, unit), bars_data))
+		return {resolution: bars_data for _, resolution, bars_data in levels}
+
+	@staticmethod
+	def aggregate_bars(bars_data, multiple, dt, origin):
+		"""
+	    Re-aggregates time bars into bars a whole multiple longer, with the Open of the first, High of the highest, Low of the lowest and
+	    Close of the last non-empty bar in each group. Empty bars (with NaN prices) are ignored and groups without any ticks are left empty.
+
+	    Parameters
+	    ----------
+	    bars_data : pandas.DataFrame
+	        DataFrame of time bars with columns Open, High, Low and Close, indexed by bar end time.
+	    multiple : int
+	        Number of bars of length dt within each aggregated bar.
+	    dt : pandas.Timedelta
+	        Length of the bars in bars_data.
+	    origin : pandas.Timestamp
+	        Time from which bar edges are measured, i.e. the start of the first bar.
+
+	    Returns
+	    -------
+	    pandas.DataFrame
+	        pandas DataFrame of aggregated bars with columns Open, High, Low and Close.
+
+	    """
+		if len(bars_data) == 0:
+			return bars_data.copy()
+		dt_ns = dt.value
+		origin_ns = pd.Timestamp(origin).value
+		end_ns = bars_data.index.values.astype('datetime64[ns]').view('i8')
+		group = (end_ns - origin_ns - dt_ns) // (dt_ns * multiple)
+		starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+		opens = bars_data['Open'].values
+		closes = bars_data['Close'].values
+		positions = np.arange(len(bars_data))
+		filled = ~pd.isna(opens)
+		first = np.minimum.reduceat(np.where(filled, positions, len(bars_data)), starts)
+		last = np.maximum.reduceat(np.where(filled, positions, -1), starts)
+		empty = last < 0
+		if empty.any():
+			opens = opens.astype(float)
+			closes = closes.astype(float)
+			first[empty] = last[empty] = 0
+		data = {'Open': opens[first],
+				'High': np.fmax.reduceat(bars_data['High'].values, starts),
+				'Low': np.fmin.reduceat(bars_data['Low'].values, starts),
+				'Close': closes[last]}
+		if empty.any():
+			for column in ['Open', 'High', 'Low', 'Close']:
+				data[column][empty] = np.nan
+		ends = origin_ns + (group[starts] + 1) * dt_ns * multiple
+		index = pd.DatetimeIndex(ends.astype('datetime64[ns]'), name = bars_data.index.name).astype(bars_data.index.values.dtype)
+		if bars_data.index.tz is not None:
+			index = index.tz_localize('UTC').tz_convert(bars_data.index.tz)
+		return pd.DataFrame(data, index = index, columns = ['Open', 'High', 'Low', 'Close'])
+
+	def reset_stream(self):
+		"""
+	    Resets the incremental state, see BarsBase.reset_stream.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		super().reset_stream()
+		self._stream_bar_t = None
+
+	def update_bars(self, timestamp, price, volume = None):
+		"""
+	    Adds a single tick to the incremental bar state. As with make_bars, bar edges are aligned to the origin (by default the first tick) and a
+	    tick landing on or after the end of the current bar closes it, along with any empty bars in between. Sessions are not applied to streams.
+
+	    Parameters
+	    ----------
+	    timestamp : pandas.Timestamp
+	        Time of the trade.
+	    price : int, float
+	        Trade price.
+	    volume : int, float, None
+	        Trade volume, unused for time bars.
+
+	    Returns
+	    -------
+	    list
+	        List of completed bars as tuples of (Timestamp, Open, High, Low, Close).
+
+	    """
+		if self.get_threshold()[0] == 0:
+			return []
+		if self._stream_bar_t is None:
+			origin = self.get_origin_Timestamp(timestamp)
+			self._stream_bar_t = origin + ((timestamp - origin) // self._dt + 1) * self._dt
+		data = self.close_bars(timestamp)
+		self._stream_OHLC = self.set_OHLC(*self._stream_OHLC, price)
+		return data
+
+	def close_bars(self, timestamp):
+		"""
+	    Closes the current bar, and any following empty bars (with NaN prices, unless skipped), if they end at or before the given time.
+	    This allows bars to be closed by a wall clock timer rather than waiting for the next tick.
+
+	    Parameters
+	    ----------
+	    timestamp : pandas.Timestamp
+	        Current time.
+
+	    Returns
+	    -------
+	    list
+	        List of completed bars as tuples of (Timestamp, Open, High, Low, Close).
+
+	    """
 		data = []
-		# initialise loop variables
-		cur_open = cur_high = cur_low = cur_close = None
-		bar_t = self.get_tick_data().index[0] + self._dt
-		for tick in self.get_tick_data().itertuples():
-			if tick.Index < bar_t:
-				# do next tick
-				cur_open, cur_high, cur_low, cur_close = self.set_OHLC(cur_open, cur_high, cur_low, cur_close, tick.price)
+		if self._stream_bar_t is None:
+			return data
+		while self._stream_bar_t <= timestamp:
+			if self._stream_OHLC[0] is None:
+				if self._empty_bars == 'skip':
+					# jump straight to the bar containing timestamp
+					self._stream_bar_t += ((timestamp - self._stream_bar_t) // self._dt + 1) * self._dt
+					break
+				data.append((self._stream_bar_t, np.nan, np.nan, np.nan, np.nan))
 			else:
-				# end bar
-				data.append((bar_t, cur_open, cur_high, cur_low, cur_close))
-				# new bar
-				cur_open = cur_open = cur_high = cur_low = cur_close = tick.price
-				bar_t += self._dt
-				while bar_t <= tick.Index:
-					data.append((bar_t, np.nan, np.nan, np.nan, np.nan))
-					bar_t += self._dt
-		# can maybe leave next line out, as, by closing bar, assuming no more trades occurred in this time period
-		data.append((bar_t, cur_open, cur_high, cur_low, tick.price))
-		self._bars_data = pd.DataFrame(data, columns=['Timestamp', 'Open', 'High', 'Low', 'Close'])
-		self._bars_data.set_index('Timestamp', inplace=True)
+				data.append((self._stream_bar_t,) + self._stream_OHLC)
+			self._stream_OHLC = (None, None, None, None)
+			self._stream_bar_t += self._dt
+		return data
+
+	def next_bar_close(self):
+		"""
+	    Returns the end time of the current incremental bar, or None if no tick has been received yet.
+
+	    Returns
+	    -------
+	    pandas.Timestamp, None
+	        End time of the current bar.
+
+	    """
+		return self._stream_bar_t
+
+	def flush_bars(self):
+		"""
+	    Ends the incremental stream, returning the final partially filled bar (as make_bars does) and resetting the stream state.
+
+	    Returns
+	    -------
+	    list
+	        List containing the final bar as a tuple of (Timestamp, Open, High, Low, Close), empty if it holds no ticks.
+
+	    """
+		data = []
+		if self._stream_bar_t is not None and self._stream_OHLC[0] is not None:
+			data.append((self._stream_bar_t,) + self._stream_OHLC)
+		self.reset_stream()
+		return data
 
 
 class VolumeBars(BarsBase):
 
-	def __init__(self, threshold, file_path, **kwargs):
+	def __init__(self, threshold, file_path = None, **kwargs):
 		"""
 	    Construct VolumeBars object where trade bars are formed by aggregating ticks until a volume threshold has been met.
         VolumeBars objects are initialised with a threshold specifying the total trade volume per bar, file path to CSV or text document along with other keyword
@@ -366,8 +1060,8 @@ class VolumeBars(BarsBase):
 	    ----------
 	    threshold : int
             Total trade volume per bar.
-        file_path : str
-            Path to data file/csv.
+        file_path : str, None
+            Path to data file/csv. If None, no tick data is loaded.
         **kwargs 
             Keyword arguments to pass through to pandas.read_csv.
             See above for required keyword arguments.
@@ -392,23 +1086,51 @@ class VolumeBars(BarsBase):
 		if self.get_threshold() == 0:
 			self._bars_data = pd.DataFrame(columns=['Open', 'High', 'Low', 'Close'])
 			return
+		if self.get_threshold() < 0:
+			raise ValueError("threshold of volume bars must be positive, not {!r}".format(self.get_threshold()))
+		self._bars_data = self._make_bars_data(lambda timestamps, prices, volumes: _engine.volume_bars(timestamps, prices, volumes, self.get_threshold()))
+
+	def reset_stream(self):
+		"""
+	    Resets the incremental state, see BarsBase.reset_stream.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		super().reset_stream()
+		self._stream_volume = 0
+
+	def update_bars(self, timestamp, price, volume = None):
+		"""
+	    Adds a single tick to the incremental bar state, closing one or more bars once the volume threshold has been met.
+
+	    Parameters
+	    ----------
+	    timestamp : pandas.Timestamp
+	        Time of the trade.
+	    price : int, float
+	        Trade price.
+	    volume : int, float
+	        Trade volume.
+
+	    Returns
+	    -------
+	    list
+	        List of completed bars as tuples of (Timestamp, Open, High, Low, Close).
+
+	    """
+		if self.get_threshold() == 0:
+			return []
 		data = []
-		cur_open = cur_high = cur_low = cur_close = None
-		volume = 0
-		for tick in self.get_tick_data().itertuples():
-			# do next tick
-			cur_open, cur_high, cur_low, cur_close = self.set_OHLC(cur_open, cur_high, cur_low, cur_close, tick.price)
-			volume += tick.volume
-			# end bar
-			if volume >= self.get_threshold():
-				# commit bar(s)
-				while volume >= self.get_threshold():
-					data.append((tick.Index, cur_open, cur_high, cur_low, cur_close))
-					volume -= self.get_threshold()
-					# new bar if still excess volume
-					cur_open = cur_high = cur_low = cur_close
-				# new bar
-				if volume == 0:
-					cur_open = None
-		self._bars_data = pd.DataFrame(data, columns=['Timestamp', 'Open', 'High', 'Low', 'Close'])
-		self._bars_data.set_index('Timestamp', inplace=True)
\ No newline at end of file
+		self._stream_OHLC = self.set_OHLC(*self._stream_OHLC, price)
+		self._stream_volume += volume
+		while self._stream_volume >= self.get_threshold():
+			data.append((timestamp,) + self._stream_OHLC)
+			self._stream_volume -= self.get_threshold()
+			# new bar if still excess volume
+			self._stream_OHLC = (self._stream_OHLC[3],) * 4
+		if data and self._stream_volume == 0:
+			self._stream_OHLC = (None, None, None, None)
+		return data
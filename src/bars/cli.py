@@ -0,0 +1,198 @@
+"""
+Command line entry point (the bars console script) building bars from a tick file and writing them as binary output, either a .npy file
+of bar records (see bars.store.BAR_DTYPE) or a BarStore directory.
+Tick files given as numpy arrays (.npy structured arrays or .npz archives with timestamp, price and volume arrays) are barred with numpy
+alone, so that pandas is only imported when a CSV file has to be parsed.
+"""
+import argparse
+import re
+import numpy as np
+from . import _engine
+from .store import BarStore, bar_records
+
+UNIT_NS = {'days': 86400 * 10**9, 'hours': 3600 * 10**9, 'minutes': 60 * 10**9, 'seconds': 10**9,
+		   'milliseconds': 10**6, 'microseconds': 10**3, 'nanoseconds': 1}
+BAR_TYPES = {'tick': 'TickBars', 'time': 'TimeBars', 'volume': 'VolumeBars'}
+ARRAY_SUFFIXES = ('.npy', '.npz')
+
+def main(argv = None):
+	"""
+    Runs the bars console script.
+
+    Parameters
+    ----------
+    argv : list, None
+        Command line arguments, by default sys.argv[1:].
+
+    Returns
+    -------
+    int
+        Exit status.
+
+    """
+	parser = _make_parser()
+	args = parser.parse_args(argv)
+	if args.output is None and args.store is None:
+		parser.error("one of --output or --store is required")
+	if args.store is not None and args.symbol is None and args.symbol_col is None:
+		parser.error("--store requires --symbol or --symbol-col")
+	if args.output is not None and args.symbol_col is not None:
+		parser.error("--symbol-col can only be used with --store")
+	if args.threshold <= 0:
+		parser.error("threshold must be positive, not {}".format(args.threshold))
+	if args.bar_type == 'tick' and not isinstance(args.threshold, int):
+		parser.error("threshold of tick bars must be an integer, not {}".format(args.threshold))
+	try:
+		origin, sessions = _parse_times(args)
+	except ValueError as error:
+		parser.error(str(error))
+	threshold = (args.threshold, args.unit) if args.bar_type == 'time' else args.threshold
+	if args.input.endswith(ARRAY_SUFFIXES):
+		if args.symbol_col is not None or args.exclude_conditions is not None:
+			parser.error("--symbol-col and --exclude-conditions are only supported for CSV input")
+		try:
+			ticks = _load_arrays(args.input, require_volume = args.bar_type == 'volume')
+		except ValueError as error:
+			parser.error(str(error))
+		out_of_order, bars_arrays = _bars_from_arrays(args, ticks, origin, sessions)
+		if args.output is not None:
+			np.save(args.output, bar_records(*bars_arrays))
+		else:
+			BarStore(args.store).write_arrays(args.symbol, BAR_TYPES[args.bar_type], threshold, *bars_arrays)
+		count = len(bars_arrays[0])
+	else:
+		bars = _bars_from_csv(args)
+		if args.output is not None:
+			np.save(args.output, bar_records(*_frame_arrays(bars.get_bars_data())))
+		else:
+			BarStore(args.store).write(bars, args.symbol)
+		out_of_order = bars.get_out_of_order_count()
+		count = len(bars.get_bars_data())
+	print("wrote {} bars to {} ({} out of order ticks)".format(count, args.output or args.store, out_of_order))
+	return 0
+
+def _make_parser():
+	"""
+    Returns the argument parser of the bars console script.
+    """
+	parser = argparse.ArgumentParser(prog = 'bars', description = "Build trade bars from a tick file and write them as binary output.")
+	parser.add_argument('bar_type', choices = sorted(BAR_TYPES), help = "type of bars")
+	parser.add_argument('threshold', type = _number, help = "ticks (a positive integer), time units or volume per bar")
+	parser.add_argument('input', help = "tick file: CSV (optionally compressed), .npy structured array or .npz archive with timestamp, price and volume arrays")
+	parser.add_argument('-o', '--output', help = "path of the .npy file of bars to write")
+	parser.add_argument('--store', help = "BarStore directory to write bars to")
+	parser.add_argument('--symbol', help = "symbol to store bars under")
+	parser.add_argument('--unit', default = 'minutes', choices = list(UNIT_NS), help = "time bar units (default: minutes)")
+	parser.add_argument('--origin', help = "time bar edge, as a time of day (HH:MM[:SS]) or a timestamp")
+	parser.add_argument('--session', action = 'append', dest = 'sessions', metavar = 'START-END', help = "time bar trading session, e.g. 09:30-16:00 (repeatable)")
+	parser.add_argument('--empty-bars', default = 'fill', choices = ['fill', 'skip'], help = "whether empty time bars are filled with NaN prices or skipped")
+	parser.add_argument('--names', default = 'price,volume', help = "comma separated CSV column names after the index column (default: price,volume)")
+	parser.add_argument('--index-col', type = int, default = 0, help = "CSV index (timestamp) column number (default: 0)")
+	parser.add_argument('--symbol-col', help = "CSV column holding each tick's symbol, bars are stored under every symbol")
+	parser.add_argument('--exclude-conditions', help = "comma separated trade condition codes to drop from CSV input")
+	return parser
+
+def _number(text):
+	"""
+    Parses a threshold as an int, or a float if it has a decimal point.
+    """
+	return float(text) if '.' in text else int(text)
+
+def _parse_times(args):
+	"""
+    Parses the time bar origin and sessions, raising a ValueError if they are malformed.
+
+    Returns
+    -------
+    tuple
+        Tuple of (origin, sessions), where origin is None, ('timestamp', nanoseconds since the epoch) or ('time', nanoseconds since
+        midnight) and sessions is None or a list of (start, end) tuples of nanoseconds since midnight.
+
+    """
+	origin = None
+	if args.origin is not None and re.match(r'\d{4}-\d{2}-\d{2}', args.origin.strip()):
+		try:
+			origin = ('timestamp', int(np.datetime64(args.origin.strip(), 'ns').astype(np.int64)))
+		except ValueError:
+			raise ValueError("--origin must be a time of day (HH:MM[:SS]) or a timestamp, not {!r}".format(args.origin)) from None
+	elif args.origin is not None:
+		try:
+			origin = ('time', _engine.time_of_day_ns(args.origin))
+		except ValueError:
+			raise ValueError("--origin must be a time of day (HH:MM[:SS]) or a timestamp, not {!r}".format(args.origin)) from None
+	sessions = None
+	if args.sessions:
+		sessions = []
+		for session in args.sessions:
+			times = session.split('-')
+			try:
+				if len(times) != 2:
+					raise ValueError
+				sessions.append(tuple(_engine.time_of_day_ns(time) for time in times))
+			except ValueError:
+				raise ValueError("--session must be given as START-END times of day (HH:MM[:SS]), e.g. 09:30-16:00, not {!r}".format(session)) from None
+	return (origin, sessions)
+
+def _load_arrays(file_path, require_volume = False):
+	"""
+    Loads tick arrays from a .npy structured array or a .npz archive, with times as int64 nanoseconds since the epoch, raising a
+    ValueError if fields are missing.
+    """
+	ticks = np.load(file_path)
+	names = (ticks.dtype.names or ()) if isinstance(ticks, np.ndarray) else ticks.files
+	required = ['timestamp', 'price'] + (['volume'] if require_volume else [])
+	missing = [name for name in required if name not in names]
+	if missing:
+		raise ValueError("{} has no {} field{}".format(file_path, ' or '.join(missing), 's' if len(missing) > 1 else ''))
+	timestamps = ticks['timestamp']
+	if np.issubdtype(timestamps.dtype, np.datetime64):
+		timestamps = timestamps.astype('datetime64[ns]').view('i8')
+	volumes = ticks['volume'] if 'volume' in names else None
+	return (timestamps.astype(np.int64), ticks['price'], volumes)
+
+def _bars_from_arrays(args, ticks, origin, sessions):
+	"""
+    Builds bars from tick arrays (see _load_arrays) with bars._engine, without pandas.
+    """
+	out_of_order, timestamps, prices, volumes = _engine.in_time_order(*ticks)
+	if args.threshold == 0 or len(timestamps) == 0:
+		return (out_of_order, (np.empty(0, dtype = np.int64),) + (np.empty(0, dtype = prices.dtype),) * 4)
+	if args.bar_type == 'tick':
+		return (out_of_order, _engine.tick_bars(timestamps, prices, args.threshold))
+	if args.bar_type == 'volume':
+		return (out_of_order, _engine.volume_bars(timestamps, prices, volumes, args.threshold))
+	if origin is None:
+		origin = timestamps[0]
+	elif origin[0] == 'timestamp':
+		origin = origin[1]
+	else:
+		origin = timestamps[0] // _engine.DAY_NS * _engine.DAY_NS + origin[1]
+	return (out_of_order, _engine.time_bars(timestamps, prices, int(args.threshold * UNIT_NS[args.unit]), int(origin), args.empty_bars == 'fill', sessions))
+
+def _bars_from_csv(args):
+	"""
+    Builds bars from a CSV tick file with the bar classes, importing pandas.
+    """
+	from .bars import TickBars, TimeBars, VolumeBars, TickFilter
+	bars_class = {'tick': TickBars, 'time': TimeBars, 'volume': VolumeBars}[args.bar_type]
+	tick_filter = TickFilter(exclude_conditions = args.exclude_conditions.split(',')) if args.exclude_conditions else None
+	bars = bars_class(args.threshold, args.input, symbol_col = args.symbol_col, tick_filter = tick_filter,
+					  index_col = args.index_col, names = args.names.split(','))
+	if args.bar_type == 'time':
+		bars.set_unit(args.unit)
+		bars.set_origin(args.origin)
+		bars.set_sessions([tuple(session.split('-')) for session in args.sessions] if args.sessions else None)
+		bars.set_empty_bars(args.empty_bars)
+	bars.make_bars()
+	return bars
+
+def _frame_arrays(bars_data):
+	"""
+    Converts a DataFrame of bars into arrays (timestamps, opens, highs, lows, closes) with times as int64 nanoseconds.
+    """
+	if len(bars_data) == 0:
+		return (np.empty(0, dtype = np.int64),) + (np.empty(0),) * 4
+	index = bars_data.index
+	if index.tz is not None:
+		index = index.tz_convert(None)
+	return (index.values.astype('datetime64[ns]').view('i8'),) + tuple(bars_data[column].values for column in ['Open', 'High', 'Low', 'Close'])
@@ -0,0 +1,279 @@
+import os
+import numpy as np
+from . import _engine
+
+BAR_DTYPE = np.dtype([('timestamp', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8')])
+DAY_NS = 86400 * 10**9
+
+# pandas is imported within the methods using it, so that bars can be written from arrays without importing pandas
+
+def bar_records(timestamps, opens, highs, lows, closes):
+	"""
+    Packs arrays of bars into a numpy structured array with fields timestamp, open, high, low and close (BAR_DTYPE).
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        int64 array of bar end times in nanoseconds since the epoch.
+    opens, highs, lows, closes : numpy.ndarray
+        Arrays of bar prices.
+
+    Returns
+    -------
+    numpy.ndarray
+        Structured array of bars.
+
+    """
+	records = np.empty(len(timestamps), dtype = BAR_DTYPE)
+	records['timestamp'] = timestamps
+	records['open'], records['high'], records['low'], records['close'] = opens, highs, lows, closes
+	return records
+
+class BarStore:
+
+	def __init__(self, root):
+		"""
+	    Construct BarStore object which persists bars to disk as binary files partitioned by symbol, bar type, threshold and date, i.e.
+	    < root >/< symbol >/< bar type >/< threshold >/< YYYY-MM-DD >.npy. Each partition holds a numpy structured array of bars sorted by
+	    their end time (nanoseconds since the epoch, UTC for timezone aware bars), so that range queries binary search into memory
+	    mapped partitions and only read the rows needed. Partitions hold UTC dates, so bars of one local trading day may span two
+	    partitions, see the tz argument of query for reading bars in local time.
+
+	    Parameters
+	    ----------
+	    root : str
+	        Path to the directory holding the store, created if it does not exist.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		self._root = root
+		os.makedirs(root, exist_ok = True)
+
+	def get_root(self):
+		"""
+	    Getter method for the store's root directory.
+
+	    Returns
+	    -------
+	    str
+	        Path to the directory holding the store.
+
+	    """
+		return self._root
+
+	def write(self, bars, symbol = None):
+		"""
+	    Writes the bars data of a bars object, after make_bars has been called, to the store. Bars of objects with a symbol column are
+	    written under each of their symbols, otherwise the symbol must be given. Partitions for the dates written are replaced.
+
+	    Parameters
+	    ----------
+	    bars : BarsBase
+	        TickBars, TimeBars or VolumeBars object whose bars have been constructed.
+	    symbol : str, None
+	        Symbol the bars are stored under, required unless the bars object has a symbol column.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		bars_data = bars.get_bars_data()
+		if bars_data is None:
+			raise ValueError("bars have not been constructed, call make_bars before writing them")
+		bar_type = type(bars).__name__
+		if bars.get_symbol_column() is not None:
+			for bars_symbol, symbol_bars in bars_data.groupby(level = 0, sort = False):
+				self.write_frame(bars_symbol, bar_type, bars.get_threshold(), symbol_bars.droplevel(0))
+		elif symbol is None:
+			raise ValueError("symbol must be given for bars without a symbol column")
+		else:
+			self.write_frame(symbol, bar_type, bars.get_threshold(), bars_data)
+
+	def write_frame(self, symbol, bar_type, threshold, bars_data):
+		"""
+	    Writes a pandas DataFrame of bars to the store, replacing partitions for the dates written.
+
+	    Parameters
+	    ----------
+	    symbol : str
+	        Symbol the bars are stored under.
+	    bar_type : str, type
+	        Bar type, e.g. 'TimeBars' or the TimeBars class.
+	    threshold : int, float, tuple
+	        Threshold of the bars as returned by get_threshold, e.g. 100 or (5, 'minutes').
+	    bars_data : pandas.DataFrame
+	        pandas DataFrame of bars with columns Open, High, Low and Close, indexed by Timestamp.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		import pandas as pd
+		if len(bars_data) == 0:
+			return
+		index = pd.DatetimeIndex(bars_data.index)
+		if index.tz is not None:
+			index = index.tz_convert(None)
+		self.write_arrays(symbol, bar_type, threshold, index.values.astype('datetime64[ns]').view('i8'),
+						  *(bars_data[column].values for column in ['Open', 'High', 'Low', 'Close']))
+
+	def write_arrays(self, symbol, bar_type, threshold, timestamps, opens, highs, lows, closes):
+		"""
+	    Writes arrays of bars to the store, replacing partitions for the dates written.
+
+	    Parameters
+	    ----------
+	    symbol : str
+	        Symbol the bars are stored under.
+	    bar_type : str, type
+	        Bar type, e.g. 'TimeBars' or the TimeBars class.
+	    threshold : int, float, tuple
+	        Threshold of the bars as returned by get_threshold, e.g. 100 or (5, 'minutes').
+	    timestamps : numpy.ndarray
+	        int64 array of bar end times in nanoseconds since the epoch, in time order.
+	    opens, highs, lows, closes : numpy.ndarray
+	        Arrays of bar prices.
+
+	    Returns
+	    -------
+	    None.
+
+	    """
+		records = bar_records(timestamps, opens, highs, lows, closes)
+		directory = self._partition_dir(symbol, bar_type, threshold)
+		os.makedirs(directory, exist_ok = True)
+		days = timestamps // DAY_NS
+		starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+		for start, end in zip(starts, np.r_[starts[1:], len(records)]):
+			path = os.path.join(directory, self._partition_name(days[start]))
+			# write then rename so readers never see a partially written partition
+			with open(path + '.tmp', 'wb') as partition:
+				np.save(partition, records[start:end])
+			os.replace(path + '.tmp', path)
+
+	def query(self, symbol, bar_type, threshold, start = None, end = None, start_time = None, end_time = None, tz = None):
+		"""
+	    Reads the bars ending between start and end (inclusive), optionally restricted to bars ending between start_time and end_time
+	    (inclusive) on each day, e.g. 5 minute bars between 10:00 and 11:00 over 90 days. Bars are stored in UTC, so without a time zone
+	    times of day, start and end without a time zone and the returned index are in UTC. With a time zone, e.g. 'America/New_York', they
+	    are in that zone's local time and the returned index is timezone aware.
+
+	    Parameters
+	    ----------
+	    symbol : str
+	        Symbol the bars are stored under.
+	    bar_type : str, type
+	        Bar type, e.g. 'TimeBars' or the TimeBars class.
+	    threshold : int, float, tuple
+	        Threshold of the bars as returned by get_threshold, e.g. 100 or (5, 'minutes').
+	    start, end : str, pandas.Timestamp, None
+	        First and last bar end times to include, unbounded if None.
+	    start_time, end_time : str, pandas.Timedelta, None
+	        Times of day between which bars are included, e.g. '10:00' or '10:00:00', unbounded if None.
+	    tz : str, datetime.tzinfo, None
+	        Time zone of the times of day and of the returned bars, or None for UTC.
+
+	    Returns
+	    -------
+	    pandas.DataFrame
+	        pandas DataFrame of bars with columns Open, High, Low and Close, indexed by Timestamp.
+
+	    """
+		import pandas as pd
+		records = self.query_arrays(symbol, bar_type, threshold, start, end, start_time, end_time, tz)
+		index = pd.DatetimeIndex(records['timestamp'].astype('datetime64[ns]'), name = 'Timestamp')
+		if tz is not None:
+			index = index.tz_localize('UTC').tz_convert(tz)
+		return pd.DataFrame({'Open': records['open'], 'High': records['high'], 'Low': records['low'], 'Close': records['close']}, index = index)
+
+	def query_arrays(self, symbol, bar_type, threshold, start = None, end = None, start_time = None, end_time = None, tz = None):
+		"""
+	    Reads bars as a numpy structured array with fields timestamp, open, high, low and close, without constructing a DataFrame.
+	    Timestamps are nanoseconds since the epoch (UTC) whatever the time zone.
+
+	    Parameters
+	    ----------
+	    See query.
+
+	    Returns
+	    -------
+	    numpy.ndarray
+	        Structured array of bars in time order.
+
+	    """
+		import pandas as pd
+		start_ns = self._utc_ns(pd.Timestamp(start), tz) if start is not None else None
+		end_ns = self._utc_ns(pd.Timestamp(end), tz) if end is not None else None
+		start_tod = self._time_of_day_ns(start_time) if start_time is not None else 0
+		end_tod = self._time_of_day_ns(end_time) if end_time is not None else DAY_NS - 1
+		directory = self._partition_dir(symbol, bar_type, threshold)
+		if not os.path.isdir(directory):
+			return np.empty(0, dtype = BAR_DTYPE)
+		first_day = start_ns // DAY_NS if start_ns is not None else None
+		last_day = end_ns // DAY_NS if end_ns is not None else None
+		selected = []
+		for name in sorted(os.listdir(directory)):
+			if not name.endswith('.npy'):
+				continue
+			day = np.datetime64(name[:-4], 'D').astype(np.int64)
+			if (first_day is not None and day < first_day) or (last_day is not None and day > last_day):
+				continue
+			partition = np.load(os.path.join(directory, name), mmap_mode = 'r')
+			timestamps = partition['timestamp']
+			# a UTC day overlaps the local days before and after it
+			for local_day in (day - 1, day, day + 1) if tz is not None else (day,):
+				lower = local_day * DAY_NS + start_tod
+				upper = local_day * DAY_NS + end_tod
+				if tz is not None:
+					lower = self._utc_ns(pd.Timestamp(lower), tz)
+					upper = self._utc_ns(pd.Timestamp(upper), tz, latest = True)
+				if start_ns is not None:
+					lower = max(lower, start_ns)
+				if end_ns is not None:
+					upper = min(upper, end_ns)
+				lo = np.searchsorted(timestamps, lower, side = 'left')
+				hi = np.searchsorted(timestamps, upper, side = 'right')
+				if hi > lo:
+					selected.append(np.array(partition[lo:hi]))
+		if not selected:
+			return np.empty(0, dtype = BAR_DTYPE)
+		return np.concatenate(selected)
+
+	@staticmethod
+	def _time_of_day_ns(time):
+		"""
+	    Returns a time of day given as an HH:MM[:SS] string (see bars._engine.time_of_day_ns) or pandas.Timedelta in nanoseconds.
+	    """
+		import pandas as pd
+		return _engine.time_of_day_ns(time) if isinstance(time, str) else pd.Timedelta(time).value
+
+	@staticmethod
+	def _utc_ns(timestamp, tz, latest = False):
+		"""
+	    Returns a Timestamp as nanoseconds since the epoch, taking Timestamps without a time zone in tz (UTC if None). Local times repeated
+	    or skipped by daylight saving changes are resolved to the earliest time, or the latest if latest is True.
+	    """
+		if timestamp.tzinfo is None and tz is not None:
+			timestamp = timestamp.tz_localize(tz, ambiguous = not latest, nonexistent = 'shift_backward' if latest else 'shift_forward')
+		return timestamp.value
+
+	def _partition_dir(self, symbol, bar_type, threshold):
+		"""
+	    Returns the directory holding the partitions for a symbol, bar type and threshold.
+	    """
+		bar_type = getattr(bar_type, '__name__', bar_type)
+		if isinstance(threshold, tuple):
+			threshold = '{}{}'.format(*threshold)
+		return os.path.join(self._root, str(symbol), bar_type, str(threshold))
+
+	@staticmethod
+	def _partition_name(day):
+		"""
+	    Returns the file name of the partition for a day given as days since the epoch.
+	    """
+		return '{}.npy'.format(np.datetime64(int(day), 'D'))
@@ -0,0 +1,108 @@
+import asyncio
+import heapq
+import itertools
+import pandas as pd
+
+async def stream_bars(bars, feed, clock = None, reorder_window = 0):
+	"""
+    Asynchronous generator which consumes an asynchronous iterator of ticks, or batches of ticks, and drives the incremental state of a
+    TickBars, TimeBars or VolumeBars object, yielding each bar as soon as it is completed.
+    Each item of the feed may be a single tick given as a tuple of (timestamp, price) or (timestamp, price, volume), an iterable of such
+    tuples or a pandas DataFrame indexed by timestamp with a < price > column (and a < volume > column for volume bars).
+    If a clock is given, time bars are also closed on a wall clock timer, i.e. a bar is yielded once the clock passes its end time rather
+    than waiting for the next tick. Ticks arriving after their bar has been closed by the timer are added to the current bar.
+    Once the feed is exhausted, the final partial bar is yielded where make_bars would also include it.
+    Ticks arriving earlier than a tick before them are counted (see get_out_of_order_count of the bars object). With a reorder window,
+    that many ticks are held back in a buffer and released earliest first, so ticks arriving up to that many places late are put back
+    in order. The buffer is emptied before bars are closed by the timer.
+
+    Parameters
+    ----------
+    bars : BarsBase
+        TickBars, TimeBars or VolumeBars object whose threshold is used to construct bars. Its incremental state is reset on start.
+    feed : async iterable
+        Asynchronous iterator of ticks or batches of ticks, in time order (up to the reorder window).
+    clock : callable, None
+        Function returning the current time as a pandas.Timestamp, e.g. pandas.Timestamp.now. If None, bars are only closed by ticks.
+    reorder_window : int
+        Number of ticks held back to reorder late ticks, 0 to process ticks as they arrive.
+
+    Yields
+    ------
+    tuple
+        Completed bar as a tuple of (Timestamp, Open, High, Low, Close).
+
+    """
+	bars.reset_stream()
+	bars.set_out_of_order_count(0)
+	ticks = feed.__aiter__()
+	pending = None
+	held = [] # heap of (timestamp, arrival number, price, volume)
+	arrivals = itertools.count()
+	latest = None
+	try:
+		while True:
+			if pending is None:
+				pending = asyncio.ensure_future(ticks.__anext__())
+			timeout = None
+			if clock is not None and bars.next_bar_close() is not None:
+				timeout = max((bars.next_bar_close() - clock()).total_seconds(), 0)
+			done, _ = await asyncio.wait({pending}, timeout = timeout)
+			if not done:
+				# timer expired before the next tick arrived
+				while held:
+					timestamp, _, price, volume = heapq.heappop(held)
+					for bar in bars.update_bars(timestamp, price, volume):
+						yield bar
+				for bar in bars.close_bars(clock()):
+					yield bar
+				continue
+			try:
+				item = pending.result()
+			except StopAsyncIteration:
+				break
+			finally:
+				pending = None
+			for timestamp, price, volume in _iter_ticks(item):
+				if latest is not None and timestamp < latest:
+					bars.set_out_of_order_count(bars.get_out_of_order_count() + 1)
+				else:
+					latest = timestamp
+				if reorder_window:
+					heapq.heappush(held, (timestamp, next(arrivals), price, volume))
+					if len(held) <= reorder_window:
+						continue
+					timestamp, _, price, volume = heapq.heappop(held)
+				for bar in bars.update_bars(timestamp, price, volume):
+					yield bar
+		while held:
+			timestamp, _, price, volume = heapq.heappop(held)
+			for bar in bars.update_bars(timestamp, price, volume):
+				yield bar
+		for bar in bars.flush_bars():
+			yield bar
+	finally:
+		if pending is not None:
+			pending.cancel()
+
+def _iter_ticks(item):
+	"""
+    Normalises a single tick or a batch of ticks from a feed into an iterator of (timestamp, price, volume) tuples.
+
+    Parameters
+    ----------
+    item : tuple, iterable, pandas.DataFrame
+        Single tick, iterable of ticks or DataFrame of ticks.
+
+    Returns
+    -------
+    iterator
+        Iterator of (timestamp, price, volume) tuples, where volume is None if not given.
+
+    """
+	if isinstance(item, pd.DataFrame):
+		volumes = item['volume'] if 'volume' in item.columns else itertools.repeat(None)
+		return zip(item.index, item['price'], volumes)
+	if isinstance(item, tuple):
+		item = (item,)
+	return ((tick[0], tick[1], tick[2] if len(tick) > 2 else None) for tick in item)
@@ -3,7 +3,20 @@ import csv
 import os
 import pandas as pd
 import numpy as np
-from bars import BarsBase, TickBars, TimeBars, VolumeBars
+import asyncio
+import io
+import contextlib
+import gzip
+import bz2
+import lzma
+import struct
+import zlib
+import zipfile
+import tempfile
+import subprocess
+import sys
+from bars import BarsBase, TickBars, TimeBars, VolumeBars, TickFilter, BarStore, stream_bars
+from bars import cli
 
 
 class BarsBaseTestCase(unittest.TestCase):
@@ -67,6 +80,33 @@ class BarsBaseTestCase(unittest.TestCase):
 		self.pandas_df = pd.read_csv(filepath_or_buffer = self.base_test_file_mod, parse_dates = True, index_col = 0, names = ['price', 'volume', 'exchange_code', 'trade_conditions'])
 		self.assertTrue(self.bars.get_tick_data().equals(self.pandas_df))
 
+	def test_set_tick_data_with_filter(self):
+		names = ['price', 'volume', 'exchange_code', 'trade_conditions']
+		# List of tuples of (test_number, tick filter, kept rows)
+		tests = [(1, TickFilter(exclude_conditions = ['M']), [0, 1, 4]),
+				 (2, TickFilter(include_exchanges = [7]), [1, 3, 4]),
+				 (3, TickFilter(exclude_exchanges = [7], exclude_conditions = ['M', 'X']), [0]),
+				 (4, TickFilter(exclude_conditions = ['E-B']), [0, 1, 2, 3, 4]), # conditions are matched individually
+				 (5, TickFilter(), [0, 1, 2, 3, 4])]
+		for (n, tick_filter, rows) in tests:
+			for chunksize in [2, None]:
+				kwargs = {'chunksize': chunksize} if chunksize else {}
+				self.bars.set_tick_data(self.base_test_file_mod, tick_filter = tick_filter, index_col = 0, names = names, **kwargs)
+				self.pandas_df = pd.read_csv(filepath_or_buffer = self.base_test_file_mod, parse_dates = True, index_col = 0, names = names).iloc[rows]
+				self.assertTrue(self.bars.get_tick_data().equals(self.pandas_df), "test number {}, chunksize {}".format(n, chunksize))
+
+	def test_set_tick_data_all_filtered(self):
+		names = ['price', 'volume', 'exchange_code', 'trade_conditions']
+		tick_filter = TickFilter(include_exchanges = [9])
+		for bars_class in [TickBars, TimeBars, VolumeBars]:
+			for symbol_col in [None, 'exchange_code']:
+				bars = bars_class(2, self.base_test_file_mod, symbol_col = symbol_col, tick_filter = tick_filter, index_col = 0, names = names)
+				self.assertEqual(len(bars.get_tick_data()), 0)
+				self.assertIsInstance(bars.get_tick_data().index, pd.DatetimeIndex)
+				bars.make_bars()
+				self.assertEqual(len(bars.get_bars_data()), 0, "{}, symbol column {}".format(bars_class.__name__, symbol_col))
+				self.assertEqual(list(bars.get_bars_data().columns), ['Open', 'High', 'Low', 'Close'])
+
 	def test_get_bars_data(self):
 		self.assertIsNone(self.bars.get_bars_data()) # None as as bars have been created
 
@@ -166,6 +206,47 @@ class TickBarsTestCase(unittest.TestCase):
 			os.remove(test_file) 
 
 
+	def test_make_bars_invalid_threshold(self):
+		test_file = 'test.csv'
+		with open(test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows([['2023-08-29 00:00:00', '10', '1'], ['2023-08-29 00:00:01', '11', '5']])
+		try:
+			for threshold in [-3, 2.5, 2.0]:
+				tickbars = TickBars(threshold, test_file, index_col = 0, names = ['price', 'volume'])
+				with self.assertRaises(ValueError):
+					tickbars.make_bars()
+			volumebars = VolumeBars(-3, test_file, index_col = 0, names = ['price', 'volume'])
+			with self.assertRaises(ValueError):
+				volumebars.make_bars()
+		finally:
+			os.remove(test_file)
+
+	def test_make_bars_mixed_precision(self):
+		# times of mixed precision are left unparsed by read_csv
+		test_file = 'test.csv'
+		mock_data = [['2023-08-29 04:00:00', '10', '1'],
+					 ['2023-08-29 04:00:00.5', '11', '5'],
+					 ['2023-08-29 04:00:01', '13', '3'],
+					 ['2023-08-29 04:00:01.25', '9', '2']]
+		with open(test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(mock_data)
+		try:
+			tickbars = TickBars(2, test_file, index_col = 0, names = ['price', 'volume'])
+			tickbars.make_bars()
+			df = tickbars.get_bars_data()
+			# the datetime unit depends on the pandas version
+			soln = pd.DataFrame({'Open': [10, 13], 'High': [11, 13], 'Low': [10, 9], 'Close': [11, 9]},
+								index = pd.DatetimeIndex(['2023-08-29 04:00:00.5', '2023-08-29 04:00:01.25'], name = 'Timestamp').astype(df.index.dtype))
+			self.assertIsInstance(df.index, pd.DatetimeIndex)
+			self.assertTrue(df.equals(soln))
+			tickbars.set_tick_data(test_file, names = ['timestamp', 'price', 'volume'])
+			with self.assertRaises(TypeError):
+				tickbars.make_bars()
+		finally:
+			os.remove(test_file)
+
 class TimeBarsTestCase(unittest.TestCase):
 
 	# test parameters and data for testing getters and setters
@@ -216,6 +297,26 @@ class TimeBarsTestCase(unittest.TestCase):
 		dt = self.timebars.get_threshold_Timedelta()
 		self.assertEqual(dt, pd.Timedelta(5, 'minutes'))
 
+	def test_set_origin(self):
+		# List of tuples of (test_number, origin, origin for a first tick at 2023-08-28 10:00)
+		tests = [(1, '09:30', pd.Timestamp(2023, 8, 28, 9, 30)),
+				 (2, '09:30:15.5', pd.Timestamp(2023, 8, 28, 9, 30, 15, 500000)),
+				 (3, pd.Timedelta(hours = 9), pd.Timestamp(2023, 8, 28, 9)),
+				 (4, '2023-08-01 09:37', pd.Timestamp(2023, 8, 1, 9, 37)),
+				 (5, None, pd.Timestamp(2023, 8, 28, 10))]
+		for (n, origin, soln) in tests:
+			self.timebars.set_origin(origin)
+			self.assertEqual(self.timebars.get_origin_Timestamp(pd.Timestamp(2023, 8, 28, 10)), soln, "test number {}".format(n))
+		for origin in ['9.30', '09:30pm', '09:75', '25:00']:
+			with self.assertRaises(ValueError):
+				self.timebars.set_origin(origin)
+
+	def test_set_sessions(self):
+		self.timebars.set_sessions([('09:30', '16:00'), ('16:30:00', pd.Timedelta(hours = 24))])
+		self.assertEqual(self.timebars.get_sessions(), [(pd.Timedelta('09:30:00'), pd.Timedelta('16:00:00')), (pd.Timedelta('16:30:00'), pd.Timedelta(days = 1))])
+		with self.assertRaises(ValueError):
+			self.timebars.set_sessions([('9', '16')])
+
 	def test_make_bars(self):
 		test_file = 'test.csv'
 		mock_data = [['2023-08-29 00:00:00', '10', '1'],
@@ -314,6 +415,182 @@ class TimeBarsTestCase(unittest.TestCase):
 			self.assertTrue(df.equals(soln), "test number {}".format(n))
 			os.remove(test_file) 
 
+	def test_make_bars_aligned_sessions(self):
+		test_file = 'test.csv'
+		mock_data = [['2023-08-28 09:29:59', '10', '1'],
+					 ['2023-08-28 09:30:01', '11', '5'],
+					 ['2023-08-28 09:31:30', '13', '3'],
+					 ['2023-08-28 09:34:10', '9', '2'],
+					 ['2023-08-28 16:00:00', '12', '3'],
+					 ['2023-08-29 09:30:00', '14', '1'],
+					 ['2023-08-29 09:32:00', '8', '1']]
+		with open(test_file, 'w', newline='') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(mock_data)
+		nan_bar = [np.nan, np.nan, np.nan, np.nan]
+		# List of tuples of (test_number, origin, sessions, empty_bars, solution)
+		tests = [(1, '09:30', [('09:30', '16:00')], 'fill', pd.DataFrame(data = [[11, 13, 11, 13], nan_bar, [9, 9, 9, 9], [14, 14, 14, 14], [8, 8, 8, 8]],
+																				   columns = ['Open', 'High', 'Low', 'Close'],
+																				   index = [pd.Timestamp(2023, 8, 28, 9, 32),
+																							pd.Timestamp(2023, 8, 28, 9, 34),
+																							pd.Timestamp(2023, 8, 28, 9, 36),
+																							pd.Timestamp(2023, 8, 29, 9, 32),
+																							pd.Timestamp(2023, 8, 29, 9, 34)])), # aligned bars filled within sessions only
+				 (2, '09:30:00', [('09:30:00', '16:00:00')], 'skip', pd.DataFrame(data = [[11, 13, 11, 13], [9, 9, 9, 9], [14, 14, 14, 14], [8, 8, 8, 8]],
+																				   columns = ['Open', 'High', 'Low', 'Close'],
+																				   index = [pd.Timestamp(2023, 8, 28, 9, 32),
+																							pd.Timestamp(2023, 8, 28, 9, 36),
+																							pd.Timestamp(2023, 8, 29, 9, 32),
+																							pd.Timestamp(2023, 8, 29, 9, 34)])), # empty bars skipped
+				 (3, '00:00:00', None, 'skip', pd.DataFrame(data = [[10, 10, 10, 10], [11, 13, 11, 13], [9, 9, 9, 9], [12, 12, 12, 12], [14, 14, 14, 14], [8, 8, 8, 8]],
+															columns = ['Open', 'High', 'Low', 'Close'],
+															index = [pd.Timestamp(2023, 8, 28, 9, 30),
+																	 pd.Timestamp(2023, 8, 28, 9, 32),
+																	 pd.Timestamp(2023, 8, 28, 9, 36),
+																	 pd.Timestamp(2023, 8, 28, 16, 2),
+																	 pd.Timestamp(2023, 8, 29, 9, 32),
+																	 pd.Timestamp(2023, 8, 29, 9, 34)])), # aligned to midnight, no sessions
+				 (4, pd.Timestamp(2023, 8, 28, 9, 29, 59), [('09:30:00', '16:00:00')], 'skip', pd.DataFrame(data = [[11, 13, 11, 13], [9, 9, 9, 9], [14, 14, 14, 14], [8, 8, 8, 8]],
+																											 columns = ['Open', 'High', 'Low', 'Close'],
+																											 index = [pd.Timestamp(2023, 8, 28, 9, 31, 59),
+																													  pd.Timestamp(2023, 8, 28, 9, 35, 59),
+																													  pd.Timestamp(2023, 8, 29, 9, 31, 59),
+																													  pd.Timestamp(2023, 8, 29, 9, 33, 59)]))] # origin given as timestamp
+		for (n, origin, sessions, empty_bars, soln) in tests:
+			timebars = TimeBars(2, test_file, index_col = 0, names = ['price', 'volume'])
+			timebars.set_origin(origin)
+			timebars.set_sessions(sessions)
+			timebars.set_empty_bars(empty_bars)
+			timebars.make_bars()
+			df = timebars.get_bars_data()
+			self.assertTrue(df.equals(soln), "test number {}".format(n))
+		with self.assertRaises(ValueError):
+			timebars.set_empty_bars('drop')
+		os.remove(test_file)
+
+	def test_make_bars_overnight_session(self):
+		test_file = 'test.csv'
+		mock_data = [['2023-08-28 17:59:00', '10', '1'],
+					 ['2023-08-28 18:00:00', '11', '5'],
+					 ['2023-08-28 23:59:00', '13', '3'],
+					 ['2023-08-29 00:01:00', '9', '2'],
+					 ['2023-08-29 05:59:00', '12', '3'],
+					 ['2023-08-29 06:00:00', '14', '1'],
+					 ['2023-08-29 18:03:00', '8', '1']]
+		with open(test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(mock_data)
+		try:
+			timebars = TimeBars(6, test_file, index_col = 0, names = ['price', 'volume'])
+			timebars.set_unit('hours')
+			timebars.set_origin('00:00')
+			timebars.set_sessions([('18:00', '06:00')])
+			timebars.make_bars()
+			# the session crossing midnight is filled between its bars, but not across the following day
+			soln = pd.DataFrame(data = [[11, 13, 11, 13], [9, 12, 9, 12], [8, 8, 8, 8]],
+								columns = ['Open', 'High', 'Low', 'Close'],
+								index = [pd.Timestamp(2023, 8, 29, 0), pd.Timestamp(2023, 8, 29, 6), pd.Timestamp(2023, 8, 30, 0)])
+			self.assertTrue(timebars.get_bars_data().equals(soln))
+		finally:
+			os.remove(test_file)
+
+	def test_make_bars_daylight_saving(self):
+		test_file = 'test.csv'
+		# ticks every 73 seconds from 04:00 UTC over the spring forward and fall back changes in New York
+		for day in ['2023-03-12', '2023-11-05']:
+			times = pd.date_range(day + ' 04:00:00', periods = 200, freq = '73s')
+			pd.DataFrame({'price': np.arange(200) % 17 + 100, 'volume': 1}, index = times).to_csv(test_file, header = False)
+			try:
+				for empty_bars in ['fill', 'skip']:
+					utc_bars = TimeBars(15, test_file, index_col = 0, names = ['price', 'volume'])
+					utc_bars.set_origin('00:00')
+					utc_bars.set_empty_bars(empty_bars)
+					utc_bars.make_bars()
+					soln = utc_bars.get_bars_data()
+					soln.index = soln.index.tz_localize('UTC').tz_convert('America/New_York')
+					timebars = TimeBars(15, test_file, index_col = 0, names = ['price', 'volume'])
+					tick_data = timebars.get_tick_data()
+					tick_data.index = tick_data.index.tz_localize('UTC').tz_convert('America/New_York')
+					timebars.set_origin('00:00')
+					timebars.set_empty_bars(empty_bars)
+					timebars.make_bars()
+					self.assertTrue(timebars.get_bars_data().equals(soln), "{}, {}".format(day, empty_bars))
+					self.assertEqual(timebars.get_out_of_order_count(), 0)
+				# sessions follow the local clock, so every bar starts within the session in local time
+				timebars.set_sessions([('01:30', '03:00')])
+				timebars.make_bars()
+				local_starts = (timebars.get_bars_data().index - pd.Timedelta(15, 'minutes')).tz_localize(None)
+				times_of_day = local_starts - local_starts.normalize()
+				self.assertTrue(len(local_starts) > 0)
+				self.assertTrue(((times_of_day >= pd.Timedelta('01:30:00')) & (times_of_day < pd.Timedelta('03:00:00'))).all(), day)
+			finally:
+				os.remove(test_file)
+
+	def test_make_pyramid_aligned(self):
+		test_file = 'test.csv'
+		mock_data = [['2023-08-28 09:30:01', '11', '5'],
+					 ['2023-08-28 09:31:30', '13', '3'],
+					 ['2023-08-28 09:44:10', '9', '2'],
+					 ['2023-08-29 10:30:00', '14', '1'],
+					 ['2023-08-29 10:32:00', '8', '1']]
+		# daylight saving time ends in New York on 2023-11-05
+		dst_data = [['2023-11-05 00:58:01', '11', '5'],
+					['2023-11-05 01:31:30', '13', '3'],
+					['2023-11-05 01:44:10', '9', '2'],
+					['2023-11-05 06:30:00', '14', '1'],
+					['2023-11-05 06:32:00', '8', '1']]
+		for data, tz in [(mock_data, None), (mock_data, 'America/New_York'), (dst_data, 'America/New_York')]:
+			with open(test_file, 'w', newline='') as csv_file:
+				writer = csv.writer(csv_file, dialect = 'excel')
+				writer.writerows(data)
+			for empty_bars in ['fill', 'skip']:
+				for symbol_col in [None, 'symbol']:
+					def make_timebars(threshold):
+						timebars = TimeBars(threshold, test_file, index_col = 0, names = ['price', 'volume'])
+						tick_data = timebars.get_tick_data()
+						if tz is not None:
+							tick_data.index = tick_data.index.tz_localize('UTC').tz_convert(tz)
+						if symbol_col is not None:
+							tick_data[symbol_col] = 'AAA'
+							timebars.set_symbol_column(symbol_col)
+						timebars.set_origin('09:30:00')
+						timebars.set_empty_bars(empty_bars)
+						return timebars
+					pyramid = make_timebars(1).make_pyramid([(5, 'minutes'), (1, 'hours')])
+					for threshold in [5, 60]:
+						direct = make_timebars(threshold)
+						direct.make_bars()
+						self.assertTrue(pyramid[(threshold, 'minutes') if threshold == 5 else (1, 'hours')].equals(direct.get_bars_data()),
+										"{}, {}, {}, {}".format(data[0][0], tz, empty_bars, symbol_col))
+		os.remove(test_file)
+
+	def test_make_pyramid(self):
+		test_file = 'test.csv'
+		mock_data = [['2023-08-29 00:00:00.50', '10', '1'],
+					 ['2023-08-29 00:00:01.00', '11', '5'],
+					 ['2023-08-29 00:00:03.00', '13', '3'],
+					 ['2023-08-29 00:00:04.00', '9', '2'],
+					 ['2023-08-29 00:00:09.00', '12', '3'],
+					 ['2023-08-29 00:00:31.00', '14', '1'],
+					 ['2023-08-29 00:01:07.25', '8', '1'],
+					 ['2023-08-29 00:03:59.00', '10.5', '1']]
+		with open(test_file, 'w', newline='') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(mock_data)
+		resolutions = [(2, 'seconds'), (5, 'seconds'), (10, 'seconds'), (1, 'minutes'), (2, 'minutes'), (1, 'hours')]
+		timebars = TimeBars(1, test_file, index_col = 0, names = ['price', 'volume'])
+		timebars.set_unit('seconds')
+		pyramid = timebars.make_pyramid(resolutions)
+		self.assertEqual(len(pyramid), len(resolutions) + 1)
+		for (threshold, unit) in [(1, 'seconds')] + resolutions:
+			direct = TimeBars(threshold, test_file, index_col = 0, names = ['price', 'volume'])
+			direct.set_unit(unit)
+			direct.make_bars()
+			self.assertTrue(pyramid[(threshold, unit)].equals(direct.get_bars_data()), "{} {}".format(threshold, unit))
+		with self.assertRaises(ValueError):
+			timebars.make_pyramid([(1500, 'milliseconds')])
+		os.remove(test_file)
+
 
 class VolumeBarsTestCase(unittest.TestCase):
 
@@ -401,4 +678,453 @@ class VolumeBarsTestCase(unittest.TestCase):
 			volumebars.make_bars()
 			df = volumebars.get_bars_data()
 			self.assertTrue(df.equals(soln), "test number {}".format(n))
-			os.remove(test_file) 
\ No newline at end of file
+			os.remove(test_file) 
+
+
+class MultiSymbolBarsTestCase(unittest.TestCase):
+
+	test_file = 'test_symbols.csv'
+	symbol_files = {'AAA': 'test_AAA.csv', 'BBB': 'test_BBB.csv'}
+	mock_data = [['2023-08-29 00:00:00', 'BBB', '20', '4'],
+				 ['2023-08-29 00:00:00', 'AAA', '10', '1'],
+				 ['2023-08-29 00:00:01', 'AAA', '11', '5'],
+				 ['2023-08-29 00:00:02', 'BBB', '21', '1'],
+				 ['2023-08-29 00:00:03', 'AAA', '13', '3'],
+				 ['2023-08-29 00:00:04', 'AAA',  '9', '2'],
+				 ['2023-08-29 00:00:05', 'BBB', '19', '3'],
+				 ['2023-08-29 00:00:09', 'AAA', '12', '3'],
+				 ['2023-08-29 00:00:12', 'BBB', '22', '2']]
+
+	@classmethod
+	def setUpClass(cls):
+		with open(cls.test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(cls.mock_data)
+		for symbol, symbol_file in cls.symbol_files.items():
+			with open(symbol_file, 'w', newline = '') as csv_file:
+				writer = csv.writer(csv_file, dialect = 'excel')
+				writer.writerows([[row[0]] + row[2:] for row in cls.mock_data if row[1] == symbol])
+
+	@classmethod
+	def tearDownClass(cls):
+		os.remove(cls.test_file)
+		for symbol_file in cls.symbol_files.values():
+			os.remove(symbol_file)
+
+	def test_make_bars(self):
+		# List of tuples of (test_number, bars class, threshold)
+		tests = [(1, TickBars, 2),
+				 (2, TimeBars, 2),
+				 (3, VolumeBars, 3),
+				 (4, TickBars, 5)]
+		for (n, bars_class, threshold) in tests:
+			bars = bars_class(threshold, self.test_file, symbol_col = 'symbol', index_col = 0, names = ['symbol', 'price', 'volume'])
+			bars.make_bars()
+			df = bars.get_bars_data()
+			self.assertEqual(list(df.index.names), ['symbol', 'Timestamp'])
+			for symbol, symbol_file in self.symbol_files.items():
+				single = bars_class(threshold, symbol_file, index_col = 0, names = ['price', 'volume'])
+				single.make_bars()
+				soln = single.get_bars_data()
+				if len(soln) == 0:
+					self.assertNotIn(symbol, df.index.get_level_values(0), "test number {}".format(n))
+				else:
+					self.assertTrue(df.xs(symbol, level = 'symbol').equals(soln), "test number {}, symbol {}".format(n, symbol))
+
+	def test_make_pyramid(self):
+		timebars = TimeBars(1, self.test_file, symbol_col = 'symbol', index_col = 0, names = ['symbol', 'price', 'volume'])
+		timebars.set_unit('seconds')
+		pyramid = timebars.make_pyramid([(2, 'seconds'), (4, 'seconds')])
+		for threshold in [2, 4]:
+			direct = TimeBars(threshold, self.test_file, symbol_col = 'symbol', index_col = 0, names = ['symbol', 'price', 'volume'])
+			direct.set_unit('seconds')
+			direct.make_bars()
+			self.assertTrue(pyramid[(threshold, 'seconds')].equals(direct.get_bars_data()), threshold)
+
+
+class OutOfOrderTicksTestCase(unittest.TestCase):
+
+	sorted_file = 'test_sorted.csv'
+	unsorted_file = 'test_unsorted.csv'
+	mock_data = [['2023-08-29 00:00:00', 'AAA', '10', '1'],
+				 ['2023-08-29 00:00:01', 'BBB', '11', '5'],
+				 ['2023-08-29 00:00:03', 'AAA', '13', '3'],
+				 ['2023-08-29 00:00:04', 'BBB',  '9', '2'],
+				 ['2023-08-29 00:00:04', 'AAA', '15', '2'],
+				 ['2023-08-29 00:00:09', 'AAA', '12', '3'],
+				 ['2023-08-29 00:00:10', 'BBB', '14', '3']]
+	# late prints moved later in the file, keeping the order of ticks with equal times
+	unsorted_order = [0, 2, 1, 3, 5, 4, 6]
+
+	@classmethod
+	def setUpClass(cls):
+		for file_name, rows in [(cls.sorted_file, cls.mock_data), (cls.unsorted_file, [cls.mock_data[i] for i in cls.unsorted_order])]:
+			with open(file_name, 'w', newline = '') as csv_file:
+				writer = csv.writer(csv_file, dialect = 'excel')
+				writer.writerows(rows)
+
+	@classmethod
+	def tearDownClass(cls):
+		os.remove(cls.sorted_file)
+		os.remove(cls.unsorted_file)
+
+	def test_make_bars(self):
+		# List of tuples of (test_number, bars class, threshold, symbol column, out of order count)
+		tests = [(1, TickBars, 2, None, 2),
+				 (2, TimeBars, 1, None, 2),
+				 (3, VolumeBars, 4, None, 2),
+				 (4, TickBars, 1, 'symbol', 1), # only one tick is out of order within its symbol
+				 (5, TimeBars, 2, 'symbol', 1)]
+		for (n, bars_class, threshold, symbol_col, count) in tests:
+			results = []
+			for file_name in [self.sorted_file, self.unsorted_file]:
+				bars = bars_class(threshold, file_name, symbol_col = symbol_col, index_col = 0, names = ['symbol', 'price', 'volume'])
+				bars.make_bars()
+				results.append(bars)
+			self.assertEqual(results[0].get_out_of_order_count(), 0, "test number {}".format(n))
+			self.assertEqual(results[1].get_out_of_order_count(), count, "test number {}".format(n))
+			self.assertTrue(results[0].get_bars_data().equals(results[1].get_bars_data()), "test number {}".format(n))
+
+	def test_stream_reorder(self):
+		ticks = [(pd.Timestamp(row[0]), float(row[2]), int(row[3])) for row in self.mock_data]
+		unsorted_ticks = [ticks[i] for i in self.unsorted_order]
+		async def feed(items):
+			for item in items:
+				yield item
+		async def collect(bars, items, reorder_window):
+			return [bar async for bar in stream_bars(bars, feed(items), reorder_window = reorder_window)]
+		bars = TimeBars(1)
+		bars.set_unit('seconds')
+		soln = asyncio.run(collect(bars, ticks, 0))
+		self.assertEqual(asyncio.run(collect(bars, unsorted_ticks, 2)), soln)
+		self.assertEqual(bars.get_out_of_order_count(), 2)
+		self.assertNotEqual(asyncio.run(collect(bars, unsorted_ticks, 0)), soln)
+		self.assertEqual(bars.get_out_of_order_count(), 2)
+
+
+class CompressedTickDataTestCase(unittest.TestCase):
+
+	test_file = 'test.csv'
+	names = ['price', 'volume', 'exchange_code', 'trade_conditions']
+
+	@classmethod
+	def setUpClass(cls):
+		rows = [['2023-05-12 04:{:02d}:{:02d}.{:06d}'.format(i // 6000, (i // 100) % 60, i % 100), str(100 + (i % 37) / 4), str(i % 13 + 1), str(i % 3 + 7), 'E-B-M' if i % 5 == 0 else 'E-B']
+				for i in range(3000)]
+		with open(cls.test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(rows)
+		with open(cls.test_file, 'rb') as csv_file:
+			cls.raw = csv_file.read()
+
+	@classmethod
+	def tearDownClass(cls):
+		os.remove(cls.test_file)
+
+	@staticmethod
+	def bgzf_compress(raw, block_size):
+		# gzip members recording their compressed size in a BC extra field, as written by bgzip
+		members = []
+		for i in range(0, len(raw), block_size):
+			block = raw[i:i + block_size]
+			compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+			deflated = compressor.compress(block) + compressor.flush()
+			header = b'\x1f\x8b\x08\x04' + b'\x00' * 4 + b'\x00\xff' + struct.pack('<H', 6) + b'BC' + struct.pack('<HH', 2, 25 + len(deflated))
+			members.append(header + deflated + struct.pack('<II', zlib.crc32(block), len(block)))
+		return b''.join(members)
+
+	def check_compressed(self, file_name, data, **kwargs):
+		with open(file_name, 'wb') as compressed_file:
+			compressed_file.write(data)
+		try:
+			for tick_filter in [None, TickFilter(exclude_conditions = ['M'])]:
+				bars = BarsBase(5, file_name, tick_filter = tick_filter, index_col = 0, names = self.names, **kwargs)
+				soln = BarsBase(5, self.test_file, tick_filter = tick_filter, index_col = 0, names = self.names).get_tick_data()
+				self.assertEqual(len(bars.get_tick_data()), len(soln))
+				self.assertTrue(bars.get_tick_data().equals(soln), file_name)
+		finally:
+			os.remove(file_name)
+
+	def test_gzip(self):
+		self.check_compressed('test.csv.gz', gzip.compress(self.raw))
+
+	def test_gzip_multi_member(self):
+		self.check_compressed('test.csv.gz', gzip.compress(self.raw[:1000]) + gzip.compress(self.raw[1000:]))
+
+	def test_gzip_bgzf(self):
+		self.check_compressed('test.csv.gz', self.bgzf_compress(self.raw, 4096))
+
+	def test_bz2(self):
+		self.check_compressed('test.csv.bz2', bz2.compress(self.raw))
+
+	def test_xz(self):
+		self.check_compressed('test.csv.xz', lzma.compress(self.raw))
+
+	def test_explicit_compression(self):
+		self.check_compressed('test.dat', gzip.compress(self.raw), compression = 'gzip')
+
+	def test_pandas_compression(self):
+		# compression methods and forms not decompressed in the background are left for pandas.read_csv
+		archive = io.BytesIO()
+		with zipfile.ZipFile(archive, 'w') as zip_file:
+			zip_file.writestr('test.csv', self.raw)
+		self.check_compressed('test.zip', archive.getvalue(), compression = 'zip')
+		self.check_compressed('test.dat', gzip.compress(self.raw), compression = {'method': 'gzip'})
+
+	def test_zstd(self):
+		try:
+			import zstandard
+		except ImportError:
+			self.skipTest("zstandard is not installed")
+		compressor = zstandard.ZstdCompressor(write_checksum = True)
+		frames = [compressor.compress(self.raw[i:i + 4096]) for i in range(0, 40960, 4096)]
+		stream = io.BytesIO()
+		with zstandard.ZstdCompressor().stream_writer(stream, closefd = False) as writer:
+			writer.write(self.raw[40960:]) # frame without content size
+		self.check_compressed('test.csv.zst', b''.join(frames) + stream.getvalue())
+
+
+class BarStoreTestCase(unittest.TestCase):
+
+	test_file = 'test.csv'
+	mock_data = [['2023-08-28 09:30:01', 'AAA', '11', '5'],
+				 ['2023-08-28 09:31:30', 'BBB', '13', '3'],
+				 ['2023-08-28 10:44:10', 'AAA', '9', '2'],
+				 ['2023-08-28 11:59:00', 'AAA', '10', '2'],
+				 ['2023-08-29 10:30:00', 'AAA', '14', '1'],
+				 ['2023-08-29 10:32:00', 'BBB', '8', '1'],
+				 ['2023-08-30 15:32:00', 'AAA', '8.5', '1']]
+
+	def setUp(self):
+		with open(self.test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(self.mock_data)
+		self.directory = tempfile.TemporaryDirectory()
+		self.store = BarStore(self.directory.name)
+		self.timebars = TimeBars(5, self.test_file, symbol_col = 'symbol', index_col = 0, names = ['symbol', 'price', 'volume'])
+		self.timebars.set_origin('00:00:00')
+		self.timebars.set_empty_bars('skip')
+		self.timebars.make_bars()
+
+	def tearDown(self):
+		self.directory.cleanup()
+		os.remove(self.test_file)
+
+	def test_write_and_query(self):
+		self.store.write(self.timebars)
+		self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'AAA', 'TimeBars', '5minutes', '2023-08-29.npy')))
+		soln = self.timebars.get_bars_data().xs('AAA', level = 'symbol').astype(float)
+		# List of tuples of (test_number, query keyword arguments, solution rows)
+		tests = [(1, {}, soln),
+				 (2, {'start': '2023-08-28 10:00', 'end': '2023-08-29 10:35'}, soln.iloc[1:4]),
+				 (3, {'start_time': '10:00:00', 'end_time': '11:00:00'}, soln.iloc[[1, 3]]),
+				 (4, {'start': '2023-08-29', 'start_time': '10:00:00', 'end_time': '16:00:00'}, soln.iloc[3:]),
+				 (5, {'start': '2023-08-31'}, soln.iloc[0:0])]
+		for (n, kwargs, rows) in tests:
+			df = self.store.query('AAA', TimeBars, (5, 'minutes'), **kwargs)
+			self.assertTrue(df.equals(rows), "test number {}".format(n))
+		self.assertEqual(len(self.store.query('CCC', 'TimeBars', (5, 'minutes'))), 0)
+		self.assertEqual(len(self.store.query_arrays('BBB', 'TimeBars', (5, 'minutes'), end = '2023-08-28 23:00')), 1)
+
+	def test_query_time_zone(self):
+		tick_data = self.timebars.get_tick_data()
+		tick_data.index = tick_data.index.tz_localize('America/New_York')
+		self.timebars.make_bars()
+		self.store.write(self.timebars)
+		soln = self.timebars.get_bars_data().xs('AAA', level = 'symbol').astype(float)
+		# partitions and times of day are UTC unless a time zone is given
+		self.assertEqual(len(self.store.query('AAA', TimeBars, (5, 'minutes'), start_time = '10:00', end_time = '11:00')), 0)
+		df = self.store.query('AAA', TimeBars, (5, 'minutes'), start_time = '10:00', end_time = '11:00', tz = 'America/New_York')
+		self.assertTrue(df.equals(soln.iloc[[1, 3]]))
+		df = self.store.query('AAA', TimeBars, (5, 'minutes'), start = '2023-08-29', end = '2023-08-29 10:35', tz = 'America/New_York')
+		self.assertTrue(df.equals(soln.iloc[[3]]))
+		# bars of one local evening stored in two UTC partitions
+		evening = pd.DataFrame({'Open': [1.0, 2.0], 'High': [1.0, 2.0], 'Low': [1.0, 2.0], 'Close': [1.0, 2.0]},
+							   index = pd.DatetimeIndex(['2023-08-30 19:58', '2023-08-30 20:02'], name = 'Timestamp').tz_localize('America/New_York'))
+		self.store.write_frame('CCC', TimeBars, (1, 'minutes'), evening)
+		self.assertEqual(len(os.listdir(os.path.join(self.directory.name, 'CCC', 'TimeBars', '1minutes'))), 2)
+		df = self.store.query('CCC', TimeBars, (1, 'minutes'), start = '2023-08-30', end = '2023-08-30 23:59', start_time = '19:00', end_time = '21:00', tz = 'America/New_York')
+		self.assertTrue(df.equals(evening))
+
+	def test_write_replaces_partitions(self):
+		tickbars = TickBars(1, self.test_file, index_col = 0, names = ['symbol', 'price', 'volume'])
+		tickbars.make_bars()
+		self.store.write(tickbars, 'ALL')
+		self.store.write(tickbars, 'ALL')
+		df = self.store.query('ALL', TickBars, 1)
+		self.assertTrue(df.equals(tickbars.get_bars_data().astype(float)))
+		with self.assertRaises(ValueError):
+			self.store.write(tickbars)
+
+
+class CommandLineTestCase(unittest.TestCase):
+
+	csv_file = 'test.csv'
+	npy_file = 'test_ticks.npy'
+	mock_data = [['2023-08-29 09:29:00', 'AAA', '10', '1'],
+				 ['2023-08-29 09:30:01', 'BBB', '11', '5'],
+				 ['2023-08-29 09:30:03', 'AAA', '13', '3'],
+				 ['2023-08-29 09:34:04', 'AAA',  '9', '2'],
+				 ['2023-08-29 09:31:09', 'BBB', '12', '3'],
+				 ['2023-08-29 09:46:00', 'AAA', '14', '3']]
+
+	def setUp(self):
+		with open(self.csv_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(self.mock_data)
+		ticks = np.zeros(len(self.mock_data), dtype = [('timestamp', 'datetime64[us]'), ('price', '<f8'), ('volume', '<i8')])
+		ticks['timestamp'] = [np.datetime64(row[0]) for row in self.mock_data]
+		ticks['price'] = [float(row[2]) for row in self.mock_data]
+		ticks['volume'] = [int(row[3]) for row in self.mock_data]
+		np.save(self.npy_file, ticks)
+		self.directory = tempfile.TemporaryDirectory()
+		self.output = os.path.join(self.directory.name, 'bars.npy')
+
+	def tearDown(self):
+		self.directory.cleanup()
+		os.remove(self.csv_file)
+		os.remove(self.npy_file)
+
+	def test_array_input_matches_csv(self):
+		# List of tuples of (test_number, command line arguments)
+		tests = [(1, ['tick', '2']),
+				 (2, ['volume', '4']),
+				 (3, ['time', '2', '--origin', '09:30', '--empty-bars', 'skip']),
+				 (4, ['time', '30', '--unit', 'seconds', '--session', '09:30-09:45']),
+				 (5, ['time', '1.5'])]
+		for (n, args) in tests:
+			with contextlib.redirect_stdout(io.StringIO()):
+				cli.main(args + [self.npy_file, '-o', self.output])
+				array_bars = np.load(self.output)
+				cli.main(args + [self.csv_file, '-o', self.output, '--names', 'symbol,price,volume'])
+				csv_bars = np.load(self.output)
+			self.assertEqual(array_bars.dtype.names, ('timestamp', 'open', 'high', 'low', 'close'), "test number {}".format(n))
+			for field in array_bars.dtype.names:
+				self.assertTrue(np.array_equal(array_bars[field], csv_bars[field], equal_nan = field != 'timestamp'), "test number {}".format(n))
+		# 2 minute bars from 09:30 with empty bars skipped, as built by TimeBars
+		timebars = TimeBars(2, self.csv_file, index_col = 0, names = ['symbol', 'price', 'volume'])
+		timebars.set_origin('09:30')
+		timebars.set_empty_bars('skip')
+		timebars.make_bars()
+		with contextlib.redirect_stdout(io.StringIO()):
+			cli.main(['time', '2', '--origin', '09:30', '--empty-bars', 'skip', self.npy_file, '-o', self.output])
+		array_bars = np.load(self.output)
+		self.assertTrue(np.array_equal(array_bars['timestamp'].astype('datetime64[ns]'), timebars.get_bars_data().index.values))
+		self.assertTrue(np.array_equal(array_bars['close'], timebars.get_bars_data()['Close'].values))
+
+	def test_store_output(self):
+		with contextlib.redirect_stdout(io.StringIO()):
+			cli.main(['tick', '1', self.csv_file, '--store', self.directory.name, '--symbol-col', 'symbol', '--names', 'symbol,price,volume'])
+		self.assertEqual(len(BarStore(self.directory.name).query('BBB', 'TickBars', 1)), 2)
+		with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+			cli.main(['tick', '1', self.csv_file])
+
+	def test_bad_arguments(self):
+		no_volume = os.path.join(self.directory.name, 'no_volume.npy')
+		np.save(no_volume, np.load(self.npy_file)[['timestamp', 'price']])
+		# List of tuples of (test_number, command line arguments, error message)
+		tests = [(1, ['volume', '4', no_volume], 'has no volume field'),
+				 (2, ['time', '2', self.npy_file, '--session', '9:30-16'], '--session must be given'),
+				 (3, ['time', '2', self.csv_file, '--session', '09:30'], '--session must be given'),
+				 (4, ['time', '2', self.npy_file, '--origin', '9.30'], '--origin must be'),
+				 (5, ['time', '2', self.npy_file, '--origin', '2023-13-01'], '--origin must be'),
+				 (6, ['tick', '-3', self.npy_file], 'threshold must be positive'),
+				 (7, ['volume', '0', self.csv_file], 'threshold must be positive'),
+				 (8, ['tick', '2.5', self.npy_file], 'must be an integer')]
+		for (n, args, message) in tests:
+			stderr = io.StringIO()
+			with self.assertRaises(SystemExit), contextlib.redirect_stderr(stderr):
+				cli.main(args + ['-o', self.output])
+			self.assertIn(message, stderr.getvalue(), "test number {}".format(n))
+
+	def test_array_input_does_not_import_pandas(self):
+		code = "import sys; from bars import cli; cli.main(sys.argv[1:]); sys.exit('pandas' in sys.modules)"
+		result = subprocess.run([sys.executable, '-c', code, 'time', '1', self.npy_file, '-o', self.output], capture_output = True)
+		self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class StreamBarsTestCase(unittest.TestCase):
+
+	test_file = 'test.csv'
+	mock_data = [['2023-08-29 00:00:00', '10', '1'],
+				 ['2023-08-29 00:00:01', '11', '5'],
+				 ['2023-08-29 00:00:03', '13', '3'],
+				 ['2023-08-29 00:00:04',  '9', '2'],
+				 ['2023-08-29 00:00:09', '12', '3']]
+
+	@classmethod
+	def setUpClass(cls):
+		with open(cls.test_file, 'w', newline = '') as csv_file:
+			writer = csv.writer(csv_file, dialect = 'excel')
+			writer.writerows(cls.mock_data)
+
+	@classmethod
+	def tearDownClass(cls):
+		os.remove(cls.test_file)
+
+	@staticmethod
+	async def fake_feed(ticks, batch_size):
+		# local in-process feed yielding single ticks or batches of ticks
+		for i in range(0, len(ticks), batch_size):
+			await asyncio.sleep(0)
+			yield ticks[i] if batch_size == 1 else ticks[i:i + batch_size]
+
+	@staticmethod
+	async def collect(bars, feed, clock = None):
+		return [bar async for bar in stream_bars(bars, feed, clock)]
+
+	def test_stream_matches_make_bars(self):
+		kwargs = dict(index_col = 0, names = ['price', 'volume'])
+		# List of tuples of (test_number, bars object)
+		tests = [(1, TickBars(2, self.test_file, **kwargs)),
+				 (2, TimeBars(1, self.test_file, **kwargs)),
+				 (3, TimeBars(4, self.test_file, **kwargs)),
+				 (4, VolumeBars(3, self.test_file, **kwargs)),
+				 (5, VolumeBars(0, self.test_file, **kwargs)),
+				 (6, TimeBars(1, self.test_file, **kwargs))]
+		tests[-1][1].set_empty_bars('skip')
+		tests[-1][1].set_origin('00:00:00.5')
+		for (n, bars) in tests:
+			if isinstance(bars, TimeBars):
+				bars.set_unit('seconds')
+			bars.make_bars()
+			soln = bars.get_bars_data()
+			ticks = list(bars.get_tick_data()[['price', 'volume']].itertuples(name = None))
+			for batch_size in [1, 2, 5]:
+				data = asyncio.run(self.collect(bars, self.fake_feed(ticks, batch_size)))
+				df = pd.DataFrame(data, columns = ['Timestamp', 'Open', 'High', 'Low', 'Close']).set_index('Timestamp')
+				self.assertTrue(df.equals(soln) or (df.empty and soln.empty), "test number {}, batch size {}".format(n, batch_size))
+
+	def test_stream_dataframe_batches(self):
+		bars = TickBars(2)
+		tick_data = pd.read_csv(self.test_file, parse_dates = True, index_col = 0, names = ['price', 'volume'])
+		async def feed():
+			yield tick_data.iloc[:3]
+			yield tick_data.iloc[3:]
+		data = asyncio.run(self.collect(bars, feed()))
+		self.assertEqual(data, [(pd.Timestamp(2023, 8, 29, 0, 0, 1), 10, 11, 10, 11),
+								(pd.Timestamp(2023, 8, 29, 0, 0, 4), 13, 13, 9, 9)])
+
+	def test_stream_wall_clock_close(self):
+		# bars must be closed by the timer without waiting for the next tick
+		bars = TimeBars(2)
+		bars.set_unit('seconds')
+		now = [pd.Timestamp(2023, 8, 29, 0, 0, 0)]
+		received = []
+		async def feed(bar_received):
+			yield (pd.Timestamp(2023, 8, 29, 0, 0, 0), 10)
+			now[0] = pd.Timestamp(2023, 8, 29, 0, 0, 5)
+			yield (pd.Timestamp(2023, 8, 29, 0, 0, 1), 11)
+			await asyncio.wait_for(bar_received.wait(), 5)
+			yield (pd.Timestamp(2023, 8, 29, 0, 0, 5), 12)
+		async def run():
+			bar_received = asyncio.Event()
+			async for bar in stream_bars(bars, feed(bar_received), clock = lambda: now[0]):
+				received.append(bar)
+				bar_received.set()
+		asyncio.run(run())
+		self.assertEqual(received[0], (pd.Timestamp(2023, 8, 29, 0, 0, 2), 10, 11, 10, 11))
+		self.assertTrue(np.isnan(received[1][1]))
+		self.assertEqual(received[1][0], pd.Timestamp(2023, 8, 29, 0, 0, 4))
+		self.assertEqual(received[2], (pd.Timestamp(2023, 8, 29, 0, 0, 6), 12, 12, 12, 12))
+		self.assertEqual(len(received), 3)